@@ -1,14 +1,36 @@
 # Link to the official documentation: https://developer.alasco.de/
 
-from alasco.data_fetcher import DataFetcher
-from alasco.data_updater import DataUpdater
-from alasco.data_transformer import DataTransformer
-from alasco.document_downloader import DocumentDownloader
-from alasco.document_uploader import DocumentUploader
+import importlib
 from alasco.utils import Utils
 
 class Alasco:
-	def __init__(self, token: str, key: str, verbose = False, download_path: str | None = None):
+	# The submodules are imported and instantiated on first access, see __getattr__
+	SUBMODULES = {
+		"data_transformer": ("alasco.data_transformer", "DataTransformer"),
+		"data_fetcher": ("alasco.data_fetcher", "DataFetcher"),
+		"data_updater": ("alasco.data_updater", "DataUpdater"),
+		"document_downloader": ("alasco.document_downloader", "DocumentDownloader"),
+		"document_uploader": ("alasco.document_uploader", "DocumentUploader"),
+	}
+	# The submodules passed to the constructor of another submodule, so that a single instance of each is shared
+	SUBMODULE_DEPENDENCIES = {
+		"document_downloader": ["data_fetcher", "data_transformer"],
+		"document_uploader": ["data_fetcher", "document_downloader"],
+	}
+
+	def __init__(
+			self,
+			token: str,
+			key: str,
+			verbose = False,
+			download_path: str | None = None,
+			cache_enabled: bool = False,
+			cache_dir: str | None = None,
+			max_retries: int = 5,
+			backend: str = "pandas",
+			max_workers: int = 16,
+			dtype_backend: str | None = None
+			):
 		"""
 		Initializes an instance of the Alasco class.
 
@@ -17,6 +39,13 @@ class Alasco:
 			key (str): The key used for authentication.
 			verbose (bool): A flag indicating whether to enable verbose mode. Defaults to False.
 			download_path (str | None): The path where documents will be downloaded. Defaults to None.
+			cache_enabled (bool): A flag indicating whether the API responses of the data_fetcher are cached. Defaults to False.
+			cache_dir (str | None): The directory where the cached responses are persisted. If None, they are only kept in memory. Defaults to None.
+			max_retries (int): The maximum number of retries of a GET call that was rate limited or failed on the server side. Defaults to 5.
+			backend (str): The library running the joins of the data_transformer, either "pandas" or "polars". Defaults to "pandas".
+			max_workers (int): The maximum number of concurrent API calls of the data_fetcher and document_downloader. Defaults to 16.
+			dtype_backend (str | None): The dtypes of the DataFrames built by the data_fetcher and data_transformer, 
+				either None for the numpy dtypes or "pyarrow" for Arrow-backed dtypes. Defaults to None.
 
 		Returns:
 			None
@@ -26,9 +55,34 @@ class Alasco:
 
 		self.utils = Utils()
 		self.header = self.utils.headerParameters(token=token, key=key)
+		# One session shared by all submodules, so that the connections to the API are reused. 
+		# Its pool holds a connection per thread of the 3 concurrent fan-outs of max_workers threads of the data_fetcher (e.g. in get_all_df), 
+		# the document_downloader never downloads more than max_workers documents at once
+		self.session = self.utils.create_session(header=self.header, max_retries=max_retries, pool_maxsize=3 * max_workers)
+
+		# Constructor arguments of the submodules, used when they are first accessed
+		self._init_args = {
+			"data_transformer": dict(verbose=verbose, backend=backend, dtype_backend=dtype_backend),
+			"data_fetcher": dict(header=self.header, verbose=verbose, session=self.session, max_workers=max_workers, cache_enabled=cache_enabled, cache_dir=cache_dir, dtype_backend=dtype_backend),
+			"data_updater": dict(header=self.header, verbose=verbose, session=self.session),
+			"document_downloader": dict(header=self.header, verbose=verbose, download_path=download_path, session=self.session, max_workers=max_workers),
+			"document_uploader": dict(header=self.header, verbose=verbose, session=self.session),
+		}
+
+	def __getattr__(self, name: str):
+		"""
+		Imports and instantiates a submodule (data_fetcher, document_downloader, ...) the first time it is accessed, 
+		so that only the submodules actually used are loaded.
+		"""
+		if name not in Alasco.SUBMODULES or "_init_args" not in self.__dict__:
+			raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
-		self.data_transformer = DataTransformer(verbose=verbose)
-		self.data_fetcher = DataFetcher(self.header, verbose=verbose)
-		self.data_updater = DataUpdater(self.header, verbose=verbose)
-		self.document_downloader = DocumentDownloader(header=self.header, verbose=verbose, download_path=download_path)
-		self.document_uploader = DocumentUploader(header=self.header, verbose=verbose)
+		module_name, class_name = Alasco.SUBMODULES[name]
+		submodule_class = getattr(importlib.import_module(module_name), class_name)
+		init_args = dict(self._init_args[name])
+		for dependency in Alasco.SUBMODULE_DEPENDENCIES.get(name, []):
+			init_args[dependency] = getattr(self, dependency)
+		instance = submodule_class(**init_args)
+		# cache the instance, so that __getattr__ is not called again for this name
+		setattr(self, name, instance)
+		return instance
@@ -1,8 +1,20 @@
 import requests
+import os
+import re
+import json
+import time
+import hashlib
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from alasco.data_transformer import DataTransformer
 from alasco.utils import Utils
 
+# The names of the files written by DataFetcher._write_cache(), the blake2b digest of the cache key, 
+# and of their temporary files, so that clear_cache() never deletes the other files of the cache_dir
+_CACHE_FILE_PATTERN = re.compile(r"[0-9a-f]{32}\.json(\.\d+\.\d+\.tmp)?")
+
 class DataFetcher:
 	"""
 	The DataFetcher class is responsible for fetching data from the Alasco API.
@@ -10,6 +22,11 @@ class DataFetcher:
 	Args:
 		header (dict): The header containing API key and token for authentication.
 		verbose (bool, optional): If True, enables verbose mode. Defaults to False.
+		session (requests.Session | None, optional): A session to reuse for the API calls. If None, a new one is created. Defaults to None.
+		max_workers (int, optional): The number of threads used to fetch independent URLs concurrently. Defaults to 16.
+		cache_enabled (bool, optional): If True, the JSON responses are cached and reused until their time to live expires. Defaults to False.
+		cache_dir (str | None, optional): A directory where the cached responses are also stored, so that they survive the session. 
+			If None, the responses are only cached in memory. Defaults to None.
 
 	Attributes:
 		URL_REPORTING (str): The URL for fetching reporting contract units.
@@ -23,11 +40,26 @@ class DataFetcher:
 		URL_INVOICES (str): The URL for fetching invoices.
 		header (dict): Stores the API key and token for authentication.
 		verbose (bool): Indicates if verbose mode is enabled.
-		transform (DataTransformer): An instance of DataTransformer to transform the fetched data.
+		session (requests.Session): The session used for the API calls, keeping the connections alive between calls.
+		max_workers (int): The number of threads used to fetch independent URLs concurrently.
+		cache_enabled (bool): Indicates if the responses are cached.
+		cache_dir (str | None): The directory where the cached responses are stored on disk.
+		cache_ttl (dict): The time to live in seconds of the cached responses, per endpoint URL.
+		transform (DataTransformer): An instance of DataTransformer to transform the fetched data, 
+			building the DataFrames with the given dtype_backend (None for the numpy dtypes, or "pyarrow").
 		utils (Utils): An instance of Utils for utility functions.
 	"""
 
-	def __init__(self, header, verbose = False) -> None:
+	def __init__(
+			self,
+			header,
+			verbose = False,
+			session: requests.Session | None = None,
+			max_workers: int = 16,
+			cache_enabled: bool = False,
+			cache_dir: str | None = None,
+			dtype_backend: str | None = None
+			) -> None:
 		self.URL_REPORTING = "https://api.alasco.de/v1/reporting/contract_units"
 		self.URL_PROJECT = "https://api.alasco.de/v1/projects/"
 		self.URL_PROPERTIES = "https://api.alasco.de/v1/properties/"
@@ -39,17 +71,41 @@ class DataFetcher:
 		self.URL_INVOICES = "https://api.alasco.de/v1/invoices/"
 		self.header = header
 		self.verbose = verbose # set to True if all details needs to be printed
-		self.transform = DataTransformer()
+		self.transform = DataTransformer(dtype_backend=dtype_backend)
 		self.utils = Utils()
+		# the pool holds a connection per thread of up to 3 concurrent fan-outs of max_workers threads (e.g. in get_all_df)
+		self.session = session if session is not None else self.utils.create_session(header=header, pool_maxsize=3 * max_workers)
+		self.max_workers = max_workers
+
+		# Response cache, the time to live of an URL is the one of the endpoint it starts with
+		self.cache_enabled = cache_enabled
+		self.cache_dir = cache_dir
+		self.CACHE_TTL_DEFAULT = 60
+		self.cache_ttl = {
+			self.URL_REPORTING: 30,
+			self.URL_PROJECT: 300,
+			self.URL_PROPERTIES: 300,
+			self.URL_CONTRACTS: 60,
+			self.URL_CHANGE_ORDERS: 30,
+			self.URL_CONTRACTORS: 300,
+			self.URL_CONTRACTING_ENTITIES: 300,
+			self.URL_CONTRACT_UNITS: 300,
+			self.URL_INVOICES: 30,
+		}
+		self._cache = {}
+		if self.cache_enabled and self.cache_dir is not None:
+			os.makedirs(self.cache_dir, exist_ok=True)
 
-	def get_json(self, url: str, filters: list = [], verbose: bool = None) -> list | RuntimeError:
+	def get_json(self, url: str, filters: list = [], verbose: bool = None, params: dict | None = None) -> list | RuntimeError:
 		"""
 		Fetches JSON data from the given URL with optional filters.
 
 		Args:
 			url (str): The URL to fetch data from.
 			filters (list, optional): A list containing attribute, operation, and filter value for filtering the data. Defaults to an empty list.
-			verbose (bool, optional): If provided, overrides the instance's verbose setting. Defaults to None.
+			verbose (bool, optional): If provided, overrides the instance's verbose setting for this call only. Defaults to None.
+			params (dict | None, optional): The query parameters already prepared with _prepare_params(). 
+				If provided, filters is ignored. Defaults to None.
 
 		Returns:
 			list: A list of JSON responses from the API.
@@ -57,39 +113,46 @@ class DataFetcher:
 		Raises:
 			RuntimeError: If an HTTP error occurs during the API call.
 		"""
-		# Override the instance's verbose setting if provided
-		if verbose is not None:
-			self.verbose = verbose
-
-		# Apply filters to the URL if provided
-		if filters:
-			attribute, operation, filter = filters
-			if isinstance(filter, list):
-				filter = ",".join(filter)
-			url = url + f"?filter[{attribute}.{operation}]={filter}"
-
+		# Override the instance's verbose setting for this call only, self.verbose is only set by the constructor
+		effective_verbose = verbose if verbose is not None else self.verbose
+
+		# Encode the filters as query parameters if they are not already prepared
+		if params is None:
+			params = self._prepare_params(filters=filters)
+
+		# Return the cached responses if they are still valid
+		cache_key = self._cache_key(url=url, params=params) if self.cache_enabled else None
+		if cache_key is not None:
+			cached_responses_json = self._read_cache(cache_key=cache_key)
+			if cached_responses_json is not None:
+				return cached_responses_json
+		endpoint_url = url
+
+		list_responses_json = []
 		try:
-			# Make the API request
-			response = requests.get(url=url, headers=self.header)
-			# Raise an HTTPError for bad responses
-			response.raise_for_status()
-			# Parse the JSON response
-			response_json = response.json()
-			list_responses_json = [response_json]
-
-			# Check for pagination and fetch additional pages if necessary
-			nextPageUrl = response_json.get("links", {}).get("next")
-			if nextPageUrl is not None:
-				nextPageUrl = response_json["links"]["next"]
-				nextPagesJSON = self.get_json(url=nextPageUrl)
-				list_responses_json += nextPagesJSON
-
-			# Print verbose information if enabled
-			if self.verbose:
-				print("\n\n")
-				print("-" * 50)
-				print(f"API call to url: {url[:100]} ...")
-				print("\n\n")
+			# Follow the pagination links until the last page is reached
+			while url is not None:
+				# Make the API request
+				# The next page links already contain the query, so the params are only sent with the first call
+				response = self.session.get(url=url, params=params, timeout=(5, 30))
+				params = None
+				# Raise an HTTPError for bad responses
+				response.raise_for_status()
+				# Parse the JSON response
+				response_json = self.utils.json_loads(response.content)
+				list_responses_json.append(response_json)
+
+				# Print verbose information if enabled
+				if effective_verbose:
+					print("\n\n")
+					print("-" * 50)
+					print(f"API call to url: {response.url[:100]} ...")
+					print("\n\n")
+
+				url = response_json.get("links", {}).get("next")
+
+			if cache_key is not None:
+				self._write_cache(cache_key=cache_key, url=endpoint_url, list_responses_json=list_responses_json)
 
 			return list_responses_json
 
@@ -103,50 +166,171 @@ class DataFetcher:
 			print(f"API call failed to url: {url}")
 			raise RuntimeError(f"Other error occurred: {err}")
 
-	def get_df(self, url, filters=None, chunk_size: int = 50):
+	def _cache_key(self, url: str, params: dict | None = None) -> str:
+		"""
+		Computes the key under which the responses of an URL and its query parameters are cached. 
+		The authentication header is part of the key, so that fetchers of different accounts sharing a cache_dir never read each other's responses.
+		"""
+		raw_key = json.dumps(self.header, sort_keys=True, default=str) + url + json.dumps(params, sort_keys=True, default=str)
+		return hashlib.blake2b(raw_key.encode(), digest_size=16).hexdigest()
+
+	def _get_cache_ttl(self, url: str) -> int:
+		"""
+		Returns the time to live in seconds for the cached responses of an URL.
+		"""
+		matching_endpoints = [endpoint for endpoint in self.cache_ttl if url.startswith(endpoint)]
+		if not matching_endpoints:
+			return self.CACHE_TTL_DEFAULT
+		return self.cache_ttl[max(matching_endpoints, key=len)]
+
+	def _read_cache(self, cache_key: str) -> list | None:
+		"""
+		Returns the cached responses for the key, first from memory then from disk, or None if they are missing or expired.
+		"""
+		entry = self._cache.get(cache_key)
+
+		if entry is None and self.cache_dir is not None:
+			cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
+			if os.path.exists(cache_file):
+				with open(cache_file, "r") as file:
+					entry = json.load(file)
+				self._cache[cache_key] = entry
+
+		if entry is None or time.time() - entry["ts"] > entry["ttl"]:
+			return None
+
+		if self.verbose:
+			print(f"Cached responses used for key: {cache_key}")
+		return list(entry["json"])
+
+	def _write_cache(self, cache_key: str, url: str, list_responses_json: list) -> None:
+		"""
+		Stores the responses in the memory cache and, if a cache_dir is set, on disk. 
+		Writing to disk is best-effort: a failure (e.g. full disk, missing permissions) is only reported in verbose mode, 
+		so that it never fails the API call whose responses are cached.
+		"""
+		entry = {"ts": time.time(), "ttl": self._get_cache_ttl(url=url), "json": list_responses_json}
+		self._cache[cache_key] = entry
+
+		if self.cache_dir is not None:
+			cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
+			# write to a temporary file first, so that a concurrent read never sees a partial file
+			tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+			try:
+				with open(tmp_file, "w") as file:
+					json.dump(entry, file)
+				os.replace(tmp_file, cache_file)
+			except OSError as error:
+				if self.verbose:
+					print(f"The responses could not be cached to {cache_file}. Error: {error}")
+				if os.path.exists(tmp_file):
+					os.remove(tmp_file)
+
+	def clear_cache(self) -> None:
+		"""
+		Invalidates all the cached responses, in memory and on disk.
+		Should be called after data has been modified on the Alasco side. 
+		Only the files written by the cache are deleted, the other files of the cache_dir are kept.
+		"""
+		self._cache.clear()
+
+		if self.cache_dir is not None and os.path.exists(self.cache_dir):
+			for file_name in os.listdir(self.cache_dir):
+				if _CACHE_FILE_PATTERN.fullmatch(file_name):
+					os.remove(os.path.join(self.cache_dir, file_name))
+
+	def _prepare_params(self, filters: list | tuple | None = None) -> dict | None:
+		"""
+		Encodes the filters as query parameters for the API call. The URL encoding is left to requests.
+
+		Args:
+			filters (list | tuple | None, optional): The attribute, operation, and filter value. 
+				If the filter value is a list or a tuple, its elements are comma separated. Defaults to None.
+
+		Returns:
+			dict | None: The query parameters, or None if no filters are provided.
+		"""
+		if not filters:
+			return None
+
+		attribute, operation, filter = filters
+		if isinstance(filter, (list, tuple)):
+			filter = ",".join(map(str, filter))
+		return {f"filter[{attribute}.{operation}]": filter}
+
+	def get_df(self, url, filters=None, chunk_size: int = 100, columns: list | None = None):
 		"""
 		Fetches data from the API and converts it to a DataFrame.
 
 		This method handles API calls with optional filters and can split large filter values into smaller chunks
-		to avoid errors with the HTTP request.
+		to avoid errors with the HTTP request. The filter values are deduplicated before chunking (None values are dropped) 
+		and the chunks are fetched concurrently.
 
 		Parameters:
 		url (str): The API endpoint URL.
 		filters (tuple, optional): A tuple containing the attribute, operation, and filter values.
 			Example: ("id", "in", [1, 2, 3, ..., 1000]). Defaults to None.
-		chunk_size (int, optional): The size of each chunk of filter values. Defaults to 50.
+		chunk_size (int, optional): The size of each chunk of filter values. Defaults to 100.
+		columns (list, optional): The flattened columns to build the DataFrame with, in order, if the schema of the endpoint is known. 
+			This skips the discovery of the columns from the records; the other fields are ignored. Defaults to None.
 
 		Returns:
 		pd.DataFrame: The concatenated DataFrame containing data from all API calls.
 		"""
-		def fetch_and_convert(url, filters):
-			listJSON = self.get_json(url=url, filters=filters, verbose=self.verbose)
-			return self.transform.convert_list_JSON_to_DataFrame(listJSON=listJSON)
-
 		if filters is not None:
 			# Destructure the filters 
 			attribute, operation, filter_values = filters
 
 			# If filter_values are lists or tuples, check if they are not too long
 			if isinstance(filter_values, (list, tuple)):
+				# Remove the None and duplicated values, keeping the order, to avoid redundant API calls
+				filter_values = list(dict.fromkeys(value for value in filter_values if value is not None))
+				filters = (attribute, operation, filter_values)
+
 				# If they are too long, split them into chunks to avoid getting an error with the HTTP request
 				if len(filter_values) > chunk_size:
 					filter_chunks = self.utils.split_list(input_list=filter_values, chunk_size=chunk_size)
-					dfs = []
+					# Encode the query parameters of each chunk once, they are then reused for all pages
+					chunk_params = [self._prepare_params(filters=(attribute, operation, chunk)) for chunk in filter_chunks]
+					if self.verbose:
+						print(f"{len(chunk_params)} concurrent API calls to url: {url}")
 
-					# Chain the API calls with the chunks and concatenate the results
-					for index, chunk in enumerate(filter_chunks):
-						if self.verbose:
-							print(f"API call Nr. {index + 1} from {len(filter_chunks)} to url: {url}")
-						chunk_filters = (attribute, operation, chunk)
-						df = fetch_and_convert(url, chunk_filters)
-						dfs.append(df)
+					# Fire the API calls for all chunks concurrently, each worker flattens its pages while the others wait for the network
+					with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+						flat_records = list(chain.from_iterable(executor.map(lambda params: self._get_flat_records(url=url, params=params), chunk_params)))
 
-					return pd.concat(dfs, ignore_index=True)
+					return self.transform.flat_records_to_dataframe(flat_records=flat_records, columns=columns)
 
-		return fetch_and_convert(url, filters)
+		listJSON = self.get_json(url=url, filters=filters, verbose=self.verbose)
+		return self.transform.convert_list_JSON_to_DataFrame(listJSON=listJSON, columns=columns)
 
 	
+	def _get_filtered_df(self, url: str, entity: str, filter_options: list, chunk_size: int = 100) -> pd.DataFrame:
+		"""
+		Fetches the data of an endpoint, filtered by the first of the filter options which value is provided.
+
+		Parameters:
+		url (str): The API endpoint URL.
+		entity (str): The name of the fetched entity, used for the verbose output.
+		filter_options (list): A list of (attribute, operation, value) tuples, in order of precedence. 
+			The options which value is None are skipped. If all values are None, fetches all the data of the endpoint.
+		chunk_size (int, optional): The size of each chunk of filter values. Defaults to 100.
+
+		Returns:
+		pd.DataFrame: DataFrame containing the fetched data.
+		"""
+		filters = next(((attribute, operation, value) for attribute, operation, value in filter_options if value is not None), None)
+
+		if self.verbose:
+			if filters is None:
+				print(f"Fetching all {entity}")
+			else:
+				attribute, operation, value = filters
+				value = f"{value[:3]} ..." if isinstance(value, (list, tuple)) else value
+				print(f"Fetching {entity} with {attribute} {operation}: {value}")
+
+		return self.get_df(url=url, filters=filters, chunk_size=chunk_size)
+
 	def get_projects(self, property_ids: list | None = None, project_name: str | None = None) -> pd.DataFrame:
 		"""
 		Fetches project data from the API, optionally filtered by property IDs or project name.
@@ -158,24 +342,11 @@ class DataFetcher:
 		Returns:
 		pd.DataFrame: DataFrame containing project data.
 		"""
-		# Determine the filters based on provided parameters
-		if project_name is not None:
-			filters = ("name", "contains", project_name)
-			if self.verbose:
-				print(f"Fetching project data for projects which name contains: {project_name}")
-		elif property_ids is not None:
-			filters = ("property", "in", property_ids)
-			if self.verbose:
-				print(f"Fetching project data for property_ids: {property_ids}")
-		else:
-			if self.verbose:
-				print("Fetching all project data.")
-			filters = None
-
-		# Fetch the project data
-		df_projects = self.get_df(url=self.URL_PROJECT, filters=filters)
-		
-		return df_projects
+		filter_options = [
+			("name", "contains", project_name),
+			("property", "in", property_ids),
+		]
+		return self._get_filtered_df(url=self.URL_PROJECT, entity="projects", filter_options=filter_options)
 
 	def get_properties(self, property_ids: list | None = None, property_name: str | None = None) -> pd.DataFrame:
 		"""
@@ -188,24 +359,11 @@ class DataFetcher:
 		Returns:
 		pd.DataFrame: DataFrame containing property data.
 		"""
-		# Determine the filters based on provided parameters
-		if property_ids is not None:
-			filters = ("id", "in", property_ids)
-			if self.verbose:
-				print(f"Fetching properties data for property_ids: {property_ids[:3]} ...")
-		elif property_name is not None:
-			filters = ("name", "contains", property_name)
-			if self.verbose:
-				print(f"Fetching properties data for property which name contains: {property_name}")
-		else:
-			if self.verbose:
-				print("Fetching all properties data.")
-			filters = None
-
-		# Fetch the properties data
-		df_properties = self.get_df(url=self.URL_PROPERTIES, filters=filters)
-
-		return df_properties
+		filter_options = [
+			("id", "in", property_ids),
+			("name", "contains", property_name),
+		]
+		return self._get_filtered_df(url=self.URL_PROPERTIES, entity="properties", filter_options=filter_options)
 
 	def get_reporting(self, project_ids: list) -> pd.DataFrame:
 		"""
@@ -232,29 +390,11 @@ class DataFetcher:
 		Returns:
 		pd.DataFrame: DataFrame containing contractor data.
 		"""
-		# Determine the filters based on provided parameters
-		if contractor_ids is not None:
-			filters = ("id", "in", contractor_ids)
-			if self.verbose:
-				print(f"Fetching contractors with ids in: {contractor_ids[:3]} ...")
-				print("-"*50)
-			if len(contractor_ids) > 50:
-				df_contractors = self.get_df(url=self.URL_CONTRACTORS, filters=filters)
-		elif contractor_name is not None:
-			filters = ("name", "contains", contractor_name)
-			if self.verbose:
-				print(f"Fetching contractors which name contains: {contractor_name}")
-				print("-"*50)
-		else:
-			filters = None
-			if self.verbose:
-				print("Fetching all contractors")
-				print("-"*50)
-
-		# Fetch the contractors data
-		df_contractors = self.get_df(url=self.URL_CONTRACTORS, filters=filters)
-
-		return df_contractors
+		filter_options = [
+			("id", "in", contractor_ids),
+			("name", "contains", contractor_name),
+		]
+		return self._get_filtered_df(url=self.URL_CONTRACTORS, entity="contractors", filter_options=filter_options)
 
 	def get_contracts(
 			self,
@@ -280,41 +420,19 @@ class DataFetcher:
 		Raises:
 		ValueError: If more than one optional parameter is provided.
 		"""
+		filter_options = [
+			("contract_number", "exact", contract_number),
+			("cost_center", "exact", cost_center),
+			("id", "in", contract_ids),
+			("contractor", "in", contractor_ids),
+			("contract_unit", "in", contract_unit_ids),
+		]
+
 		# Check that only one of the optional parameters is not None
-		optional_params = [contract_number, cost_center, contract_ids, contractor_ids, contract_unit_ids]
-		if sum(param is not None for param in optional_params) > 1:
+		if sum(value is not None for _, _, value in filter_options) > 1:
 			raise ValueError("Only one of the optional parameters can be not None.")
 
-		# Determine the filters based on provided parameters
-		if contract_number is not None:
-			filters = ("contract_number", "exact", contract_number)
-			if self.verbose:
-				print(f"Fetching contracts with contract number: {contract_number}")
-		elif cost_center is not None:
-			filters = ("cost_center", "exact", cost_center)
-			if self.verbose:
-				print(f"Fetching contracts with cost center: {cost_center}")
-		elif contract_ids is not None:
-			filters = ("id", "in", contract_ids)
-			if self.verbose:
-				print(f"Fetching contracts with ids in: {contract_ids[:3]} ...")
-		elif contractor_ids is not None:
-			filters = ("contractor", "in", contractor_ids)
-			if self.verbose:
-				print(f"Fetching contracts with contractor ids in: {contractor_ids[:3]} ...")
-		elif contract_unit_ids is not None:
-			filters = ("contract_unit", "in", contract_unit_ids)
-			if self.verbose:
-				print(f"Fetching contracts with contract unit ids in: {contract_unit_ids[:3]} ...")
-		else:
-			filters = None
-			if self.verbose:
-				print("Fetching all contracts")
-
-		# Fetch the contracts data
-		df_contracts = self.get_df(url=self.URL_CONTRACTS, filters=filters)
-
-		return df_contracts
+		return self._get_filtered_df(url=self.URL_CONTRACTS, entity="contracts", filter_options=filter_options)
 
 	def get_contracting_entities(self, name: str | None = None):
 		"""
@@ -326,17 +444,10 @@ class DataFetcher:
 		Returns:
 		pd.DataFrame: DataFrame containing contracting entities data.
 		"""
-		filters = ("name", "contains", name) if name is not None else None
-
-		if self.verbose:
-			if name is not None:
-				print(f"Fetching contracting entities which name contains: {name}")
-			else:
-				print("Fetching all contracting entities.")
-
-		df_contracting_entities = self.get_df(url=self.URL_CONTRACTING_ENTITIES, filters=filters)
-
-		return df_contracting_entities
+		filter_options = [
+			("name", "contains", name),
+		]
+		return self._get_filtered_df(url=self.URL_CONTRACTING_ENTITIES, entity="contracting entities", filter_options=filter_options)
 
 	def get_contract_units(self, contract_unit_ids: list | None = None, project_ids: list | None = None) -> pd.DataFrame:
 		"""
@@ -349,23 +460,11 @@ class DataFetcher:
 		Returns:
 		pd.DataFrame: DataFrame containing contract units data.
 		"""
-		if contract_unit_ids is not None:
-			filters = ("id", "in", contract_unit_ids)
-			if self.verbose:
-				print(f"Fetching contract units with ids in: {contract_unit_ids[:3]}...")
-		elif project_ids is not None:
-			filters = ("project", "in", project_ids)
-			if self.verbose:
-				print(f"Fetching contract units with project ids in: {project_ids[:3]} ...")
-		else:
-			filters = None
-			if self.verbose:
-				print("Fetching all contract units")
-
-		# Fetch the contract units data
-		df_contract_units = self.get_df(url=self.URL_CONTRACT_UNITS, filters=filters)
-
-		return df_contract_units
+		filter_options = [
+			("id", "in", contract_unit_ids),
+			("project", "in", project_ids),
+		]
+		return self._get_filtered_df(url=self.URL_CONTRACT_UNITS, entity="contract units", filter_options=filter_options)
 
 	def get_invoices(self, invoice_ids: list | None = None, contract_ids: list | None = None) -> pd.DataFrame:
 		"""
@@ -378,23 +477,11 @@ class DataFetcher:
 		Returns:
 		pd.DataFrame: DataFrame containing invoices data.
 		"""
-		if invoice_ids is not None:
-			filters = ("id", "in", invoice_ids)
-			if self.verbose:
-				print(f"Fetching invoices with ids in: {invoice_ids[:3]} ...")
-		elif contract_ids is not None:
-			filters = ("contract", "in", contract_ids)
-			if self.verbose:
-				print(f"Fetching invoices with contract ids in: {contract_ids[:3]} ...")
-		else:
-			filters = None
-			if self.verbose:
-				print("Fetching all invoices")
-
-		# Fetch the invoices data
-		df_invoices = self.get_df(url=self.URL_INVOICES, filters=filters)
-
-		return df_invoices
+		filter_options = [
+			("id", "in", invoice_ids),
+			("contract", "in", contract_ids),
+		]
+		return self._get_filtered_df(url=self.URL_INVOICES, entity="invoices", filter_options=filter_options)
 	
 	def get_change_orders(self, change_order_ids: list | None = None, contract_ids: list | None = None) -> pd.DataFrame:
 		"""
@@ -410,27 +497,21 @@ class DataFetcher:
 		Raises:
 		ValueError: If neither change_order_ids nor contract_ids are provided.
 		"""
-		if change_order_ids is not None:
-			if self.verbose:
-				print(f"Fetching change orders with ids in: {change_order_ids[:3]} ...")
-			filters = ("id", "in", change_order_ids)
-		elif contract_ids is not None:
-			if self.verbose:
-				print(f"Fetching change orders belonging to contract ids in: {contract_ids[:3]} ...")
-			filters = ("contract", "in", contract_ids)
-		else:
+		if change_order_ids is None and contract_ids is None:
 			raise ValueError("Please provide either a list of change order ids or a list of contract ids.")
 
-		df_change_orders = self.get_df(url=self.URL_CHANGE_ORDERS, filters=filters)
-
-		return df_change_orders
+		filter_options = [
+			("id", "in", change_order_ids),
+			("contract", "in", contract_ids),
+		]
+		return self._get_filtered_df(url=self.URL_CHANGE_ORDERS, entity="change orders", filter_options=filter_options)
 		
 	def get_all_df(self, property_name: str | None = None, project_name: str | None = None):
 		"""
 		Fetches and returns multiple DataFrames based on the provided property name and project name.
 
-		This method sequentially fetches properties, projects, contract units, contracts, contractors, invoices, 
-		and change orders from the API, and returns them as a dictionary of DataFrames.
+		This method sequentially fetches properties, projects, contract units and contracts from the API, 
+		then concurrently fetches contractors, invoices and change orders, and returns them as a dictionary of DataFrames.
 
 		Parameters:
 		property_name (str | None, optional): Property name to filter the properties. If None, fetches all properties.
@@ -462,15 +543,18 @@ class DataFetcher:
 		df_contracts = self.get_contracts(contract_unit_ids=contract_unit_ids)
 		contract_ids = self.utils.get_ids(df_contracts)
 
-		# Fetch contractor IDs from contracts
-		contractor_ids = df_contracts["contractor"].tolist()
-		# Filter the None elements (for example, if a contract has been added without entering the contractor)
-		contractor_ids = [id for id in contractor_ids if id is not None]
+		# Fetch the unique contractor IDs from contracts
+		# Drop the None elements (for example, if a contract has been added without entering the contractor)
+		contractor_ids = df_contracts["contractor"].dropna().unique().tolist()
 
-		# Fetch contractors, invoices, and change orders
-		df_contractors = self.get_contractors(contractor_ids=contractor_ids)
-		df_invoices = self.get_invoices(contract_ids=contract_ids)
-		df_change_orders = self.get_change_orders(contract_ids=contract_ids)
+		# Fetch contractors, invoices, and change orders concurrently, as they are independent from each other
+		with ThreadPoolExecutor(max_workers=3) as executor:
+			future_contractors = executor.submit(self.get_contractors, contractor_ids=contractor_ids)
+			future_invoices = executor.submit(self.get_invoices, contract_ids=contract_ids)
+			future_change_orders = executor.submit(self.get_change_orders, contract_ids=contract_ids)
+			df_contractors = future_contractors.result()
+			df_invoices = future_invoices.result()
+			df_change_orders = future_change_orders.result()
 
 		# Collect all DataFrames into a dictionary
 		dfs = {
@@ -485,6 +569,57 @@ class DataFetcher:
 
 		return dfs
 	
+	def _get_df_concurrently(self, urls: list) -> pd.DataFrame:
+		"""
+		Fetches several independent URLs concurrently, using a pool of max_workers threads, 
+		and builds a single DataFrame from all their responses.
+
+		Args:
+			urls (list): The URLs to fetch.
+
+		Returns:
+			pd.DataFrame: A DataFrame containing the data of all URLs, in order. Empty if there is no data.
+		"""
+		# each worker flattens the pages of its URL, then the records of all URLs are gathered in a single flat list
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			flat_records = list(chain.from_iterable(executor.map(lambda url: self._get_flat_records(url=url), urls)))
+
+		return self.transform.flat_records_to_dataframe(flat_records=flat_records)
+
+	def _get_flat_records(self, url: str, params: dict | None = None) -> list:
+		"""
+		Fetches all pages of an URL and returns their flattened records.
+
+		Args:
+			url (str): The URL to fetch.
+			params (dict | None, optional): The query parameters of the first call. Defaults to None.
+
+		Returns:
+			list: The flattened records of all pages.
+		"""
+		responses_json = self.get_json(url=url, params=params)
+		return [flat_record for response_json in responses_json for flat_record in self.transform.flatten_page(JSONdata=response_json)]
+
+	def _get_documents(self, endpoint: str, ids: list) -> pd.DataFrame:
+		"""
+		Fetches and concatenates the documents of the given objects, shared by the get_*_documents methods.
+
+		Args:
+			endpoint (str): The endpoint of the objects, e.g. 'contracts', 'change_orders' or 'invoices'.
+			ids (list): A list of IDs of the objects for which to fetch documents.
+
+		Returns:
+			pd.DataFrame: A DataFrame containing the concatenated documents, empty if no document is uploaded.
+		"""
+		if self.verbose:
+			label = endpoint[:-1].replace("_", " ")
+			print(f"Getting {label} documents for {len(ids)} documents with ids : {ids[:3]} ...")
+
+		base_url = self.utils.BASE_URL
+		urls = [f"{base_url}{endpoint}/{object_id}/documents/" for object_id in ids]
+		# if no document is uploaded, will return an empty DataFrame
+		return self._get_df_concurrently(urls=urls)
+
 	def get_contract_documents(self, contract_ids: list) -> pd.DataFrame:
 		"""
 		Fetches and concatenates contract documents for the given contract IDs.
@@ -500,24 +635,8 @@ class DataFetcher:
 			>>> df_contract_documents = downloader.get_contract_documents(contract_ids)
 			>>> print(df_contract_documents)
 		"""
+		return self._get_documents(endpoint="contracts", ids=contract_ids)
 
-		if self.verbose:
-			print(f"Getting contract documents for {len(contract_ids)} documents with ids : {contract_ids[:3]} ...")
-
-		urls = [self.utils._prepare_url_get_contract_documents(contract_id) for contract_id in contract_ids]
-		collection = []
-		for url in urls:
-			doc = self.get_df(url=url)
-			if not doc.empty:
-				collection.append(doc)
-
-		# if no document is uploaded, will return an empty DataFrame		
-		if not collection:
-			return pd.DataFrame()
-		else:
-			df_contract_documents = pd.concat(collection)
-			return df_contract_documents
-		
 	def get_change_order_documents(self, change_order_ids: list) -> pd.DataFrame:
 		"""
 		Fetches and concatenates change order documents for the given change order IDs.
@@ -533,22 +652,7 @@ class DataFetcher:
 			>>> df_change_order_documents = downloader.get_change_order_documents(change_order_ids)
 			>>> print(df_change_order_documents)
 		"""
-			
-		if self.verbose:
-			print(f"Getting change order documents for {len(change_order_ids)} documents with ids : {change_order_ids[:3]} ...")
-		urls = [self.utils._prepare_url_get_change_order_documents(change_order_id) for change_order_id in change_order_ids]
-		collection = []
-		for url in urls:
-			doc = self.get_df(url=url)
-			if not doc.empty:
-				collection.append(doc)
-
-		# if no document is uploaded, will return an empty DataFrame		
-		if not collection:
-			return pd.DataFrame()
-		else:
-			df_change_order_documents = pd.concat(collection)
-			return df_change_order_documents
+		return self._get_documents(endpoint="change_orders", ids=change_order_ids)
 
 	def get_invoice_documents(self, invoice_ids: list) -> pd.DataFrame:
 		"""
@@ -565,19 +669,4 @@ class DataFetcher:
 			>>> df_invoice_documents = downloader.get_invoice_documents(invoice_ids)
 			>>> print(df_invoice_documents)
 		"""
-		if self.verbose:
-			print(f"Getting invoice documents for {len(invoice_ids)} documents with ids : {invoice_ids[:3]} ...")
-
-		urls = [self.utils._prepare_url_get_invoice_documents(invoice_id) for invoice_id in invoice_ids]
-		collection = []
-		for url in urls:
-			doc = self.get_df(url=url)
-			if not doc.empty:
-				collection.append(doc)
-		
-		# if no document is uploaded, will return an empty DataFrame		
-		if not collection:
-			return pd.DataFrame()
-		else:
-			df_invoice_documents = pd.concat(collection)
-			return df_invoice_documents
\ No newline at end of file
+		return self._get_documents(endpoint="invoices", ids=invoice_ids)
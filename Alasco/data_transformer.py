@@ -1,22 +1,167 @@
 import pandas as pd
 from alasco.utils import Utils
 
+# polars is an optional dependency (pip install alasco[polars]) to run the consolidation joins multithreaded
+try:
+	import polars as pl
+except ImportError:
+	pl = None
+
+# pyarrow is an optional dependency (pip install alasco[arrow]) to store the columns in Arrow arrays
+try:
+	import pyarrow
+except ImportError:
+	pyarrow = None
+
+# The functions below are pure: they only depend on their arguments and never touch shared state, 
+# so they can safely run concurrently, e.g. in the threads fetching the pages in DataFetcher.
+
+def _flatten_record(record: dict, parent_key: str = "") -> dict:
+	"""
+	Flattens a JSON:API record into a single level dict, like pd.json_normalize but specialized for the Alasco payloads.
+
+	The keys of nested dicts are joined with a dot (e.g. 'relationships.contract.data.id'), 
+	except for the top level 'attributes' dict which keys are used as is. Lists are kept as values.
+
+	Parameters:
+		record (dict): The record to flatten.
+		parent_key (str): The key prefix of the flattened values. Default is an empty string.
+
+	Returns:
+		dict: The flattened record.
+	"""
+	flat_record = {}
+	_flatten_into(flat_record=flat_record, record=record, parent_key=parent_key)
+	return flat_record
+
+def _flatten_into(flat_record: dict, record: dict, parent_key: str) -> None:
+	"""
+	Writes the flattened values of a nested dict directly into flat_record, 
+	so that no intermediate dict is allocated per nesting level.
+	"""
+	for key, value in record.items():
+		if not parent_key and key == "attributes" and isinstance(value, dict):
+			# the attributes are the columns of the record, their prefix is dropped
+			for attribute_key, attribute_value in value.items():
+				if isinstance(attribute_value, dict):
+					_flatten_into(flat_record=flat_record, record=attribute_value, parent_key=attribute_key)
+				else:
+					flat_record[attribute_key] = attribute_value
+			continue
+
+		full_key = f"{parent_key}.{key}" if parent_key else key
+		if isinstance(value, dict):
+			_flatten_into(flat_record=flat_record, record=value, parent_key=full_key)
+		else:
+			flat_record[full_key] = value
+
+def _extract_records(JSONdata: dict) -> list:
+	"""
+	Returns the records of the 'data' key of a JSON object as a list.
+
+	Raises:
+		KeyError: If the 'data' key is not found in the JSON object.
+	"""
+	if 'data' not in JSONdata:
+		raise KeyError("'data' key not found in the JSON response")
+	data = JSONdata["data"]
+	return [data] if isinstance(data, dict) else data
+
+def _flatten_page(JSONdata: dict) -> list:
+	"""
+	Returns the flattened records of the 'data' key of a JSON object, e.g. one page of an API response.
+
+	Raises:
+		KeyError: If the 'data' key is not found in the JSON object.
+	"""
+	return [_flatten_record(record=record) for record in _extract_records(JSONdata=JSONdata)]
+
+def _infer_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+	"""
+	Replaces the object dtype of the columns by a native dtype where possible, so that hashing operations 
+	like drop_duplicates() or merge() run on the fast native kernels.
+	Booleans columns with missing values are converted to the nullable 'boolean' dtype.
+	"""
+	df = df.infer_objects()
+
+	for column in df.columns[df.dtypes == object]:
+		# infer_dtype scans the values in C, and stops at the first value which is not a boolean (e.g. in a string column)
+		if pd.api.types.infer_dtype(df[column], skipna=True) == "boolean":
+			df[column] = df[column].astype("boolean")
+
+	return df
+
+def _build_df(flat_records: list, dtype_backend: str | None = None, columns: list | None = None) -> pd.DataFrame:
+	"""
+	Builds a single pandas DataFrame from flattened records, drops the columns that contain only NaN values 
+	and infers the native dtypes. Returns an empty DataFrame if there is no record.
+
+	If the columns are known, pandas skips the scan of the keys of all records, the columns are kept in the given order 
+	(even if they only contain NaN values) and the keys of the records that are not in columns are ignored.
+
+	With dtype_backend="pyarrow", the columns are converted to Arrow-backed dtypes instead, 
+	e.g. string[pyarrow] for the ids, which are stored contiguously and hashed without touching Python objects.
+	"""
+	if not flat_records:
+		return pd.DataFrame(columns=columns)
+
+	df = pd.DataFrame.from_records(flat_records, columns=columns)
+	if columns is None:
+		# Only drop the empty columns if there are some, as dropna() always copies all the blocks
+		empty_columns = df.columns[df.isna().all()]
+		if len(empty_columns) > 0:
+			df = df.drop(columns=empty_columns)
+	if dtype_backend == "pyarrow":
+		df = df.convert_dtypes(dtype_backend="pyarrow")
+	else:
+		df = _infer_dtypes(df=df)
+
+	return df
+
 class DataTransformer:
 	"""
 	A class used to transform JSON data into pandas DataFrames and perform other utility functions.
 
+	The methods never mutate the instance, so a DataTransformer can be shared between threads.
+
 	Attributes:
 		verbose (bool): If True, enables verbose output.
+		backend (str): The library running the joins of the consolidate_* methods, either "pandas" or "polars".
+		dtype_backend (str | None): The dtypes of the built DataFrames, either None for the numpy dtypes or "pyarrow".
 	"""
 
-	def __init__(self, verbose=False) -> None:
+	BACKENDS = ["pandas", "polars"]
+	DTYPE_BACKENDS = [None, "pyarrow"]
+
+	def __init__(self, verbose=False, backend: str = "pandas", dtype_backend: str | None = None) -> None:
 		"""
 		Initializes the Transform class with optional verbose output.
 
 		Parameters:
 			verbose (bool): If True, enables verbose output. Default is False.
+			backend (str): The library running the joins of the consolidate_* methods, either "pandas" or "polars". 
+				The inputs and outputs are pandas DataFrames in both cases. Default is "pandas".
+			dtype_backend (str | None): The dtypes of the DataFrames built from the JSON data. 
+				None keeps the numpy dtypes, "pyarrow" uses Arrow-backed dtypes (e.g. string[pyarrow]), 
+				which use less memory and speed up the joins and deduplications on the id columns. Default is None.
+
+		Raises:
+			ValueError: If the backend or the dtype_backend is not supported.
+			ImportError: If the "polars" backend is requested but polars is not installed, 
+				or the "pyarrow" dtype_backend is requested but pyarrow is not installed.
 		"""
+		if backend not in self.BACKENDS:
+			raise ValueError(f"The backend must be one of {self.BACKENDS}.\nYou specified: {backend}.")
+		if backend == "polars" and pl is None:
+			raise ImportError("The 'polars' backend requires polars. Install it with: pip install alasco[polars]")
+		if dtype_backend not in self.DTYPE_BACKENDS:
+			raise ValueError(f"The dtype_backend must be one of {self.DTYPE_BACKENDS}.\nYou specified: {dtype_backend}.")
+		if dtype_backend == "pyarrow" and pyarrow is None:
+			raise ImportError("The 'pyarrow' dtype_backend requires pyarrow. Install it with: pip install alasco[arrow]")
+
 		self.verbose = verbose
+		self.backend = backend
+		self.dtype_backend = dtype_backend
 		self.utils = Utils()
 
 	def convert_JSON_to_DataFrame(self, JSONdata, verbose: bool = None) -> pd.DataFrame:
@@ -25,7 +170,7 @@ class DataTransformer:
 
 		Parameters:
 			JSONdata (dict): The JSON data to convert. Must contain a 'data' key with the data to be converted.
-			verbose (bool): If True, enables verbose output for this function call. Default is None.
+			verbose (bool): If True, enables verbose output for this function call only. Default is None.
 
 		Returns:
 			pd.DataFrame: The converted DataFrame.
@@ -33,60 +178,167 @@ class DataTransformer:
 		Raises:
 			KeyError: If the 'data' key is not found in the JSON response.
 		"""
-		if verbose is not None:
-			self.verbose = verbose
-
-		if self.verbose:
+		effective_verbose = verbose if verbose is not None else self.verbose
+		if effective_verbose:
 			print("Function convertOneJSONtoDataFrame called.")
 			print("The data in the json object is:\n")
 			self.utils.printJSON(JSONdata)
 
-		if 'data' not in JSONdata:
-			raise KeyError("'data' key not found in the JSON response")
+		return pd.DataFrame.from_records(_flatten_page(JSONdata=JSONdata))
 
-		df = pd.json_normalize(data=JSONdata["data"])
-		columns = df.columns
-		NameDict = {name: name.split("attributes.")[-1] for name in columns}
-		df.rename(mapper=NameDict, axis=1, inplace=True)
+	def convert_list_JSON_to_DataFrame(self, listJSON: list, loads = None, columns: list | None = None) -> pd.DataFrame:
+		"""
+		Converts a list of JSON objects to a single pandas DataFrame.
 
-		return df
+		The records of all JSON objects are gathered first, so that the DataFrame is built only once.
+
+		Parameters:
+			listJSON (list): A list of JSON data to convert. Each element in the list should be a dictionary representing a JSON object, 
+				or the raw bytes or string of a JSON object, which is then decoded with loads.
+			loads (callable, optional): The function used to decode the raw JSON objects. 
+				If None, uses orjson if it is installed, else the standard json module. Default is None.
+			columns (list, optional): The flattened columns of the DataFrame, in order, if the schema of the data is known. 
+				They are all kept, and the other keys of the records are ignored. If None, the columns are discovered from the records. Default is None.
+
+		Returns:
+			pd.DataFrame: The DataFrame containing data from all JSON objects in the list. If any JSON object does not contain data, it will be filtered out.
 
-	def convert_list_JSON_to_DataFrame(self, listJSON: list) -> pd.DataFrame:
+		Raises:
+			TypeError: If listJSON is not a list.
+			KeyError: If the 'data' key is not found in one of the JSON objects.
+			Elements that are neither a dictionary nor a raw JSON object raise the error of loads (e.g. a TypeError or a JSONDecodeError).
 		"""
-		Converts a list of JSON objects to a single pandas DataFrame.
+		# The elements are not checked upfront, as a full pass over the list only to validate it is pure overhead: 
+		# an invalid element fails when it is decoded or flattened below
+		if not isinstance(listJSON, list):
+			raise TypeError("listJSON must be a list of dictionaries or raw JSON objects")
+
+		# Decode the raw JSON objects
+		if loads is None:
+			loads = self.utils.json_loads
+		listJSON = [item if isinstance(item, dict) else loads(item) for item in listJSON]
+
+		flat_records = [flat_record for JSONdata in listJSON for flat_record in _flatten_page(JSONdata=JSONdata)]
+		return _build_df(flat_records=flat_records, dtype_backend=self.dtype_backend, columns=columns)
+
+	@staticmethod
+	def flatten_page(JSONdata: dict) -> list:
+		"""
+		Flattens the records of one JSON object, e.g. one page of an API response.
 
 		Parameters:
-			listJSON (list): A list of JSON data to convert. Each element in the list should be a dictionary representing a JSON object.
+			JSONdata (dict): The JSON data. Must contain a 'data' key.
 
 		Returns:
-			pd.DataFrame: The concatenated DataFrame containing data from all JSON objects in the list. If any JSON object does not contain data, it will be filtered out.
+			list: The flattened records, to be passed to flat_records_to_dataframe().
 
 		Raises:
-			TypeError: If listJSON is not a list of dictionaries.
+			KeyError: If the 'data' key is not found in the JSON object.
 		"""
-		if not isinstance(listJSON, list) or not all(isinstance(item, dict) for item in listJSON):
-			raise TypeError("listJSON must be a list of dictionaries")
+		return _flatten_page(JSONdata=JSONdata)
 
-		# Convert each JSON object to a DataFrame
-		dfs = [self.convert_JSON_to_DataFrame(JSONdata=json) for json in listJSON]
+	def flat_records_to_dataframe(self, flat_records: list, columns: list | None = None) -> pd.DataFrame:
+		"""
+		Builds a single pandas DataFrame from records already flattened with flatten_page().
 
-		# Filter out DataFrames that are either empty and drop columns that contain only NaN values
-		dfs = [df.dropna(axis=1, how="all") for df in dfs if not df.empty]
+		Parameters:
+			flat_records (list): The flattened records to convert.
+			columns (list, optional): The columns of the DataFrame, in order, if the schema is known. Default is None.
 
-		# If there are more than 1 DataFrame, concatenate them
-		if len(dfs) > 1:  
-			df = pd.concat(dfs, ignore_index=True)
-		elif len(dfs) == 1:
-			df = dfs[0]
-		else:
-			df = pd.DataFrame()
-		return df
+		Returns:
+			pd.DataFrame: The DataFrame with the columns that contain only NaN values dropped. Empty if there is no record.
+		"""
+		return _build_df(flat_records=flat_records, dtype_backend=self.dtype_backend, columns=columns)
 	# INSERT_YOUR_REWRITE_HERE
 
+	def _join_frames(self, df: pd.DataFrame, lookups: list) -> pd.DataFrame:
+		"""
+		Inner joins a DataFrame successively with lookup DataFrames, using the configured backend.
+
+		With the "pandas" backend, the keys of the DataFrame are factorized once into integer codes 
+		and the keys of the lookup are mapped onto the same codes, so that the join hashes integers instead of the id strings. 
+		The lookup rows which key is not in the DataFrame are dropped before the join. The keys keep their dtype in the result.
+		With the "polars" backend, the joins are fused in a single lazy query that runs multithreaded; 
+		the row order of the result is then not guaranteed.
+
+		Parameters:
+			df (pd.DataFrame): The left DataFrame.
+			lookups (list): A list of (lookup DataFrame, key) tuples, joined in order. 
+				The key must be a column of the lookup and of the DataFrame joined so far.
+
+		Returns:
+			pd.DataFrame: The joined DataFrame.
+		"""
+		if self.backend == "polars":
+			lazy_frame = pl.from_pandas(df).lazy()
+			for lookup, key in lookups:
+				lazy_frame = lazy_frame.join(pl.from_pandas(lookup).lazy(), on=key, how="inner")
+			return lazy_frame.collect().to_pandas()
+
+		for lookup, key in lookups:
+			# missing keys get their own code, so that they still match each other like in pd.merge
+			codes, uniques = pd.factorize(df[key], use_na_sentinel=False)
+			lookup_codes = uniques.get_indexer(lookup[key])
+			matched = lookup_codes >= 0
+			lookup = lookup.loc[matched].drop(columns=key).set_axis(pd.Index(lookup_codes[matched], name="__key_code"), axis=0)
+			df = df.assign(__key_code=codes).join(lookup, on="__key_code", how="inner").drop(columns="__key_code")
+		return df
+
+	@staticmethod
+	def _check_columns(df: pd.DataFrame, required_columns: list, name: str) -> None:
+		"""
+		Checks that a DataFrame contains the required columns, with a single set lookup per column.
+
+		Parameters:
+			df (pd.DataFrame): The DataFrame to check.
+			required_columns (list): The columns that must be present.
+			name (str): The name of the DataFrame, used in the error message.
+
+		Raises:
+			KeyError: If any required column is missing, listing the missing columns.
+		"""
+		columns = frozenset(df.columns)
+		if not columns.issuperset(required_columns):
+			missing_cols = [col for col in required_columns if col not in columns]
+			raise KeyError(f"Required columns missing in '{name}' DataFrame: {missing_cols}")
+
+	@staticmethod
+	def _is_unique(df: pd.DataFrame, columns: list | None) -> bool:
+		"""
+		Checks whether the rows of a DataFrame are unique on the given columns. 
+		Only the given columns are hashed, which is much cheaper than deduplicating a wide DataFrame.
+
+		Parameters:
+			df (pd.DataFrame): The DataFrame to check.
+			columns (list | None): The columns forming the key. If None or missing in df, the check fails.
+
+		Returns:
+			bool: True if no two rows share the same key.
+		"""
+		if not columns or not all(col in df.columns for col in columns):
+			return False
+		return not df.duplicated(subset=columns).any()
+
+	@staticmethod
+	def _drop_duplicates(df: pd.DataFrame, id_column: str) -> pd.DataFrame:
+		"""
+		Drops the duplicated rows of a DataFrame and resets its index.
+		Only the id column is hashed, as it uniquely identifies a row. Falls back to all columns if it is missing.
+
+		Parameters:
+			df (pd.DataFrame): The DataFrame to deduplicate.
+			id_column (str): The name of the column that uniquely identifies a row.
+
+		Returns:
+			pd.DataFrame: The deduplicated DataFrame with a fresh index.
+		"""
+		subset = [id_column] if id_column in df.columns else None
+		return df.drop_duplicates(subset=subset, keep="last", ignore_index=True)
+
 	def consolidate_core_DataFrames(self, dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
 		"""
 		Consolidates multiple DataFrames into a single DataFrame by merging them on specific keys. 
-		It creates a copy of the input DataFrame to avoid side effects.
+		The input DataFrames are never mutated: only the needed columns are selected, which creates new DataFrames.
 
 		Parameters:
 		dfs (dict[str, pd.DataFrame]): A dictionary containing the DataFrames to be consolidated. 
@@ -106,32 +358,29 @@ class DataTransformer:
 			if key not in dfs:
 				raise KeyError(f"'{key}' key not found in the input dictionary")
 
-		# Create copies of the DataFrames to avoid mutating the original dfs
-		properties_df = dfs["properties"].copy()
-		projects_df = dfs["projects"].copy()
-		contract_units_df = dfs["contract_units"].copy()
-		contracts_df = dfs["contracts"].copy()
-		contractors_df = dfs["contractors"].copy()
+		# No copies are needed: the column selections below return new DataFrames and the original dfs are never mutated
+		properties_df = dfs["properties"]
+		projects_df = dfs["projects"]
+		contract_units_df = dfs["contract_units"]
+		contracts_df = dfs["contracts"]
+		contractors_df = dfs["contractors"]
 
 		# Check for required columns in the 'properties' DataFrame
-		if not all(col in properties_df.columns for col in ["id", "name"]):
-			raise KeyError("Required columns missing in 'properties' DataFrame")
+		self._check_columns(df=properties_df, required_columns=["id", "name"], name="properties")
 		# Select and rename columns in the 'properties' DataFrame
 		df_core = properties_df[["id", "name"]]
 		df_core = df_core.rename(columns={"id": "property_id", "name": "property_name"})
 
 		# Check for required columns in the 'projects' DataFrame
-		if not all(col in projects_df.columns for col in ["id", "name", "relationships.property.data.id"]):
-			raise KeyError("Required columns missing in 'projects' DataFrame")
+		self._check_columns(df=projects_df, required_columns=["id", "name", "relationships.property.data.id"], name="projects")
 		# Select and rename columns in the 'projects' DataFrame
 		projects_df = projects_df[["id", "name", "relationships.property.data.id"]]
 		projects_df = projects_df.rename(columns={"id": "project_id", "name": "project_name", "relationships.property.data.id": "property_id"})
-		# Merge 'projects' DataFrame with the main DataFrame on 'property_id'
-		df_core = pd.merge(df_core, projects_df, on="property_id")
+		# The 'projects' DataFrame is joined with the main DataFrame on 'property_id'
+		lookups = [(projects_df, "property_id")]
 
 		# Check for required columns in the 'contract_units' DataFrame
-		if not all(col in contract_units_df.columns for col in ["id", "name", "relationships.project.data.id"]):
-			raise KeyError("Required columns missing in 'contract_units' DataFrame")
+		self._check_columns(df=contract_units_df, required_columns=["id", "name", "relationships.project.data.id"], name="contract_units")
 		# Select and rename columns in the 'contract_units' DataFrame
 		contract_units_df = contract_units_df[["id", "name", "relationships.project.data.id"]]
 		contract_units_df = contract_units_df.rename(columns={
@@ -139,12 +388,11 @@ class DataTransformer:
 			"name": "contract_unit_name", 
 			"relationships.project.data.id": "project_id",
 			})
-		# Merge 'contract_units' DataFrame with the main DataFrame on 'project_id'
-		df_core = pd.merge(df_core, contract_units_df, on="project_id")
+		# The 'contract_units' DataFrame is joined with the main DataFrame on 'project_id'
+		lookups.append((contract_units_df, "project_id"))
 
 		# Check for required columns in the 'contracts' DataFrame
-		if not all(col in contracts_df.columns for col in ["id", "name", "contract_number", "contract_unit", "contractor"]):
-			raise KeyError("Required columns missing in 'contracts' DataFrame")
+		self._check_columns(df=contracts_df, required_columns=["id", "name", "contract_number", "contract_unit", "contractor"], name="contracts")
 		# Select and rename columns in the 'contracts' DataFrame
 		contracts_df = contracts_df[["id", "name", "contract_number", "contract_unit", "contractor"]]
 		contracts_df = contracts_df.rename(columns={
@@ -153,19 +401,22 @@ class DataTransformer:
 			"contract_unit": "contract_unit_id",
 			"contractor": "contractor_id"
 		})
-		# Merge 'contracts' DataFrame with the main DataFrame on 'contract_unit_id'
-		df_core = pd.merge(df_core, contracts_df, on="contract_unit_id")		
+		# The 'contracts' DataFrame is joined with the main DataFrame on 'contract_unit_id'
+		lookups.append((contracts_df, "contract_unit_id"))
 
 		# Check for required columns in the 'contractors' DataFrame
-		if not all(col in contractors_df.columns for col in ["id", "name"]):
-			raise KeyError("Required columns missing in 'contractors' DataFrame")
+		self._check_columns(df=contractors_df, required_columns=["id", "name"], name="contractors")
 		# Select and rename columns in the 'contractors' DataFrame
 		contractors_df = contractors_df[["id", "name"]]
 		contractors_df = contractors_df.rename(columns={"id": "contractor_id", "name": "contractor_name"})
-		# Merge 'contractors' DataFrame with the main DataFrame on 'contractor_id'
-		df_core = pd.merge(df_core, contractors_df, on="contractor_id")
-		df_core = df_core.drop_duplicates()
-		df_core = df_core.reset_index(drop=True)
+		# The 'contractors' DataFrame is joined with the main DataFrame on 'contractor_id'
+		lookups.append((contractors_df, "contractor_id"))
+
+		# Join all the DataFrames at once
+		df_core = self._join_frames(df=df_core, lookups=lookups)
+		df_core = self._drop_duplicates(df=df_core, id_column="contract_id")
+		# Record the key on which df_core is unique, so that the next consolidations can skip their deduplication
+		df_core.attrs["unique_key"] = ["contract_id"]
 
 		return df_core
 		
@@ -185,15 +436,15 @@ class DataTransformer:
 		"""
 		# Check for required columns in the 'df_invoices' DataFrame
 		required_columns = ["id", "contract", "external_identifier"]
-		if not all(col in df_invoices.columns for col in required_columns):
-			missing_cols = [col for col in required_columns if col not in df_invoices.columns]
-			raise KeyError(f"Required columns missing in 'df_invoices' DataFrame: {missing_cols}")
+		self._check_columns(df=df_invoices, required_columns=required_columns, name="df_invoices")
 
-		df_invoices_copy = df_invoices[required_columns].copy()
-		df_invoices_copy = df_invoices_copy.rename(columns={"id": "invoice_id", "contract": "contract_id", "external_identifier": "invoice_number"})
-		df_merged = pd.merge(df_core, df_invoices_copy, on="contract_id")
-		df_merged = df_merged.drop_duplicates()
-		df_merged = df_merged.reset_index(drop=True)
+		df_invoices_copy = df_invoices[required_columns].rename(columns={"id": "invoice_id", "contract": "contract_id", "external_identifier": "invoice_number"})
+		df_merged = self._join_frames(df=df_core, lookups=[(df_invoices_copy, "contract_id")])
+		# The join cannot create duplicates if df_core is unique on its key and each invoice appears once
+		if self._is_unique(df=df_core, columns=df_core.attrs.get("unique_key")) and df_invoices_copy["invoice_id"].is_unique:
+			df_merged = df_merged.reset_index(drop=True)
+		else:
+			df_merged = self._drop_duplicates(df=df_merged, id_column="invoice_id")
 
 		return df_merged
 
@@ -213,20 +464,20 @@ class DataTransformer:
 		"""
 		# Check for required columns in the 'df_change_orders' DataFrame
 		required_columns = ["id", "contract", "name", "identifier"]
-		if not all(col in df_change_orders.columns for col in required_columns):
-			missing_cols = [col for col in required_columns if col not in df_change_orders.columns]
-			raise KeyError(f"Required columns missing in 'df_change_orders' DataFrame: {missing_cols}")
+		self._check_columns(df=df_change_orders, required_columns=required_columns, name="df_change_orders")
 
-		df_change_orders_copy = df_change_orders[required_columns].copy()
-		df_change_orders_copy = df_change_orders_copy.rename(columns={
+		df_change_orders_copy = df_change_orders[required_columns].rename(columns={
 			"id": "change_order_id", 
 			"contract": "contract_id",
 			"name": "change_order_name",
 			"identifier": "change_order_identifier"
 			})
-		df_merged = pd.merge(df_core, df_change_orders_copy, on="contract_id")
-		df_merged = df_merged.drop_duplicates()
-		df_merged = df_merged.reset_index(drop=True)
+		df_merged = self._join_frames(df=df_core, lookups=[(df_change_orders_copy, "contract_id")])
+		# The join cannot create duplicates if df_core is unique on its key and each change order appears once
+		if self._is_unique(df=df_core, columns=df_core.attrs.get("unique_key")) and df_change_orders_copy["change_order_id"].is_unique:
+			df_merged = df_merged.reset_index(drop=True)
+		else:
+			df_merged = self._drop_duplicates(df=df_merged, id_column="change_order_id")
 		
 		return df_merged
 
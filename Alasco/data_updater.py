@@ -1,6 +1,9 @@
+import requests
+from alasco.utils import Utils
+
 class DataUpdater:
 
-	def __init__(self, header, verbose = False) -> None:
+	def __init__(self, header, verbose = False, session: requests.Session | None = None) -> None:
 		self.URL_REPORTING = "https://api.alasco.de/v1/reporting/contract_units"
 		self.URL_PROJECT = "https://api.alasco.de/v1/projects/"
 		self.URL_PROPERTIES = "https://api.alasco.de/v1/properties/"
@@ -11,4 +14,5 @@ class DataUpdater:
 		self.URL_INVOICES = "https://api.alasco.de/v1/invoices/"
 		self.header = header
 		self.verbose = verbose # set to True if all details needs to be printed
+		self.session = session if session is not None else Utils().create_session(header=header)
 		
\ No newline at end of file
@@ -1,13 +1,122 @@
 import requests
 import os
+import shutil
+import threading
+import urllib3
+import uuid
 import pandas as pd
-import re
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from alasco.data_fetcher import DataFetcher
 from alasco.data_transformer import DataTransformer
 from alasco.utils import Utils
 from datetime import date
 from typing import Dict, List
 
+# tqdm is an optional dependency (pip install alasco[progress]) to display the progress of the downloads in verbose mode
+try:
+	from tqdm.auto import tqdm
+except ImportError:
+	tqdm = None
+
+# Characters kept in the fields used to name the downloaded documents, all the others are removed
+_ALLOWED_CHARACTERS = frozenset(string.ascii_letters + string.digits + "_-() ")
+
+class _SanitizeTable(dict):
+	"""
+	Translation table for str.translate, mapping the allowed characters to themselves and deleting all the others. 
+	The entries are added the first time a character is seen, so that any unicode character is covered without a regex.
+	"""
+	def __missing__(self, codepoint: int) -> int | None:
+		value = codepoint if chr(codepoint) in _ALLOWED_CHARACTERS else None
+		self[codepoint] = value
+		return value
+
+_SANITIZE_TABLE = _SanitizeTable({ord(character): ord(character) for character in _ALLOWED_CHARACTERS})
+
+def _sanitize(values: pd.Series) -> pd.Series:
+	"""
+	Removes the characters that are not in _ALLOWED_CHARACTERS from all values of a Series at once. Missing values become empty strings.
+	"""
+	return values.astype(object).fillna("").astype(str).str.translate(_SANITIZE_TABLE)
+
+def _build_names(df: pd.DataFrame, columns: list, document_type: str, document_type_position: int | None = None) -> pd.Series:
+	"""
+	Builds the file names of all rows of a DataFrame at once, by joining with underscores the sanitized columns 
+	and the document type, followed by the '.pdf' extension.
+
+	Parameters:
+		df (pd.DataFrame): The DataFrame containing the columns.
+		columns (list): The columns forming the name, in order.
+		document_type (str): The document type included in the name.
+		document_type_position (int | None): The position of the document type among the parts of the name. If None, it is the last part.
+
+	Returns:
+		pd.Series: The file names, with the index of df.
+	"""
+	parts = [_sanitize(df[column]) for column in columns]
+	position = len(parts) if document_type_position is None else document_type_position
+	parts.insert(position, pd.Series(document_type, index=df.index, dtype=object))
+	return parts[0].str.cat(parts[1:], sep="_") + ".pdf"
+
+def _unique_names(names: list) -> list:
+	"""
+	Makes the file names of a batch of downloads unique, so that two documents never write to the same file concurrently. 
+	A repeated name gets a counter before its extension, e.g. 'name.pdf', 'name_2.pdf', 'name_3.pdf', in the order of the names.
+	"""
+	used = set(names)
+	counts = {}
+	unique_names = []
+	for name in names:
+		counts[name] = counts.get(name, 0) + 1
+		if counts[name] == 1:
+			unique_names.append(name)
+			continue
+		root, extension = os.path.splitext(name)
+		# skip the counters already taken by another name of the batch
+		while f"{root}_{counts[name]}{extension}" in used:
+			counts[name] += 1
+		unique_name = f"{root}_{counts[name]}{extension}"
+		used.add(unique_name)
+		unique_names.append(unique_name)
+	return unique_names
+
+# The flags of the temporary files of the downloads: created exclusively, so that two downloads never share one, 
+# and in binary mode (O_BINARY only exists on Windows, where it disables the translation of the line endings)
+_PART_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+# How the documents of each kind are fetched, joined to the input DataFrame and named, see DocumentDownloader._download_kind(). 
+# The name_columns are the only columns of the input DataFrame kept by the join, and the ones used by the _name_* methods
+_DOCUMENT_KINDS = {
+	"contract": dict(
+		label="contract",
+		id_column="contract_id",
+		fetch="get_contract_documents",
+		fetch_argument="contract_ids",
+		relationship="relationships.contract.data.id",
+		name_columns=["contractor_name", "contract_number"],
+		name="_name_contract",
+	),
+	"invoice": dict(
+		label="invoice",
+		id_column="invoice_id",
+		fetch="get_invoice_documents",
+		fetch_argument="invoice_ids",
+		relationship="relationships.invoice.data.id",
+		name_columns=["contractor_name", "contract_number", "invoice_number"],
+		name="_name_invoice",
+	),
+	"change_order": dict(
+		label="change order",
+		id_column="change_order_id",
+		fetch="get_change_order_documents",
+		fetch_argument="change_order_ids",
+		relationship="relationships.change_order.data.id",
+		name_columns=["contractor_name", "contract_number", "change_order_identifier"],
+		name="_name_change_order",
+	),
+}
+
 class DocumentDownloader:
 	"""
 	Initializes the DocumentDownloader class.
@@ -16,49 +125,80 @@ class DocumentDownloader:
 		header (dict): The header containing API key and token for authentication.
 		verbose (bool, optional): If True, enables verbose mode. Defaults to False.
 		download_path (str | None, optional): The path where documents will be downloaded. 
-			If None, defaults to an empty string. If "standard", defaults to "outputs/{today's date}". Defaults to None.
+			If None, defaults to the current directory. If "standard", defaults to "outputs/{today's date}". Defaults to None.
+		session (requests.Session | None, optional): A session used for the downloads and shared with the DataFetcher. If None, a new one is created. Defaults to None.
+		max_workers (int, optional): The number of threads used to fetch the document links and to download the documents concurrently. Defaults to 16.
+		data_fetcher (DataFetcher | None, optional): The DataFetcher used to fetch the document links, e.g. the one of the Alasco client. If None, a new one is created. Defaults to None.
+		data_transformer (DataTransformer | None, optional): The DataTransformer used to consolidate the DataFrames, e.g. the one of the Alasco client. If None, a new one is created. Defaults to None.
 
 	Attributes:
 		header (dict): Stores the API key and token for authentication.
 		verbose (bool): Indicates if verbose mode is enabled.
 		BASE_URL (str): The base URL for the Alasco API.
+		max_workers (int): The maximum number of documents downloaded concurrently, across all the download_documents() calls.
 		data_fetcher (DataFetcher): An instance of DataFetcher to fetch data from the API.
+		data_transformer (DataTransformer): An instance of DataTransformer to consolidate the DataFrames.
 		today (date): The current date.
 		download_path (str): The path where documents will be downloaded.
 	"""
 
-	def __init__(self, header, verbose = False, download_path: str | None = None) -> None:
+	def __init__(
+			self,
+			header,
+			verbose = False,
+			download_path: str | None = None,
+			session: requests.Session | None = None,
+			max_workers: int = 16,
+			data_fetcher: DataFetcher | None = None,
+			data_transformer: DataTransformer | None = None
+			) -> None:
 		self.header = header
 		self.verbose = verbose
 		self.BASE_URL = "https://api.alasco.de/v1/"
-		self.data_fetcher = DataFetcher(header=header, verbose=verbose)
-		self.data_transformer = DataTransformer(verbose=verbose)
 		self.utils = Utils()
+		# the pool holds a connection per thread of the 3 concurrent fan-outs of the DataFetcher (e.g. in get_all_df)
+		self.session = session if session is not None else self.utils.create_session(header=header, pool_maxsize=3 * max_workers)
+		self.max_workers = max_workers
+		# At most max_workers documents are downloaded at once over the shared session, 
+		# even when several download_documents() calls run concurrently (e.g. the projects of batch_download_documents())
+		self._download_slots = threading.BoundedSemaphore(max_workers)
+		self.data_fetcher = data_fetcher if data_fetcher is not None else DataFetcher(header=header, verbose=verbose, session=self.session, max_workers=max_workers)
+		self.data_transformer = data_transformer if data_transformer is not None else DataTransformer(verbose=verbose)
 		self.today = date.today()
 
 		if download_path is None:
-			download_path = "/"
+			download_path = "."
 		elif download_path == "standard":
-			download_path = f"outputs/{self.today}"
+			download_path = os.path.join("outputs", str(self.today))
 
 		self.download_path = download_path
 		
-		if not os.path.exists(self.download_path):
-			os.makedirs(self.download_path)
-			print(f"{self.download_path} was created")
-		else:
-			print(f"{self.download_path} already exist")
+		# a single call, which does nothing if the directory already exists
+		os.makedirs(self.download_path, exist_ok=True)
+		if self.verbose:
+			print(f"The documents will be downloaded in {self.download_path}")
 
 
-	def download_documents(self, document_download_links: list, document_names: list, download_path: str | None = None):
+	def download_documents(self, document_download_links: list, document_names: list, download_path: str | None = None, fsync: bool = False, force: bool = False, verify_size: bool = False) -> list:
 		"""
 		Downloads documents from the provided download links and saves them with the given names.
+		The documents are downloaded concurrently and streamed to disk, so that only a small buffer per download is kept in memory.
+		A failed download does not abort the others: the failures are printed and their links returned, in the order in which they failed.
+		The documents already saved by a previous run are skipped, so that an interrupted download can simply be started again.
+		Repeated names are made unique with a counter, e.g. 'name_2.pdf', so that each document is saved to its own file.
 
 		Args:
 			document_download_links (list): A list of URLs from which to download documents.
 			document_names (list): A list of names to save the downloaded documents as.
 			download_path (str | None, optional): The path where documents will be downloaded. 
 				If None, uses the instance's download_path attribute. Defaults to None.
+			fsync (bool, optional): If True, each document is flushed to the disk before the download is considered done. Defaults to False.
+			force (bool, optional): If True, the documents are downloaded again even if their file already exists. Defaults to False.
+			verify_size (bool, optional): If True, an existing file is only skipped if its size matches the Content-Length 
+				returned by a HEAD request on its link, so that a document changed since the previous run is downloaded again. Defaults to False.
+
+		Returns:
+			list: The links of the documents that could not be downloaded, empty if all downloads succeeded.
 
 		Raises:
 			IndexError: If the lengths of document_download_links and document_names do not match.
@@ -67,6 +207,7 @@ class DocumentDownloader:
 			>>> document_download_links = ["https://example.com/doc1", "https://example.com/doc2"]
 			>>> document_names = ["doc1.pdf", "doc2.pdf"]
 			>>> downloader.download_documents(document_download_links, document_names)
+			[]
 		"""
 
 		# Check if the lengths of the download links and names match
@@ -78,60 +219,129 @@ class DocumentDownloader:
 			download_path = self.download_path
 
 		# Create the download directory if it does not exist
-		if not os.path.exists(download_path):
-			os.makedirs(download_path)
-			print(f"Created directory: {download_path}")
+		os.makedirs(download_path, exist_ok=True)
+
+		# Download the documents concurrently, each one saved with the corresponding name. 
+		# Several documents can get the same name (e.g. all the documents of a contract when the document type is not filtered)
+		file_names = [os.path.join(download_path, name) for name in _unique_names(document_names)]
+		failed_links = []
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			futures = {
+				executor.submit(self._download_document, link=link, file_name=file_name, fsync=fsync, force=force, verify_size=verify_size): link
+				for link, file_name in zip(document_download_links, file_names)
+			}
+			# Handle each download as soon as it is done, so that a slow document does not hold back the others. 
+			# A hung connection is bounded by the timeout of the request in _download_document
+			completed = as_completed(futures)
+			if self.verbose and tqdm is not None:
+				# a single progress bar instead of one print per document, which would serialize the workers on stdout
+				completed = tqdm(completed, total=len(futures), desc=f"Downloading to {download_path}", unit="doc")
+			for future in completed:
+				if not future.result():
+					failed_links.append(futures[future])
 
-		# Download each document and save it with the corresponding name
-		for name, link in zip(document_names, document_download_links):
-			if self.verbose:
-				print(f"Downloading document from {name}")
-
-			response = requests.get(link, headers=self.header)
-			if response.status_code == 200:
-				file_name = os.path.join(download_path, name)
-				with open(file_name, 'wb') as file:
-					file.write(response.content)
-				if self.verbose:
-					print(f"Document saved to {file_name}")
-			else:
-				print(f"Failed to download document from {link}. Status code: {response.status_code}")
-
-	def _name_contract(self, row: pd.Series, document_type: str | None = None) -> str:
+		if self.verbose:
+			print(f"{len(futures) - len(failed_links)} of {len(futures)} documents saved to {download_path}")
+
+		return failed_links
+
+	def _download_document(self, link: str, file_name: str, fsync: bool = False, force: bool = False, verify_size: bool = False) -> bool:
+		"""
+		Downloads a single document and streams it from the socket to the given file, by chunks of 64 KiB.
+		The document is first written to a temporary file of its own in the same directory, renamed once complete, 
+		so that a file with the final name is always complete.
+
+		Args:
+			link (str): The URL from which to download the document.
+			file_name (str): The path of the file to save the document as.
+			fsync (bool, optional): If True, the file is flushed to the disk before returning. Defaults to False.
+			force (bool, optional): If True, the document is downloaded even if a non-empty file_name already exists. Defaults to False.
+			verify_size (bool, optional): If True, an existing file is only kept if its size matches the Content-Length of the link. Defaults to False.
+
+		Returns:
+			bool: True if the document was saved or already existed, False if the download failed.
+		"""
+		# wait for a free download slot, the request to check the size of an existing file included
+		with self._download_slots:
+			if not force and os.path.isfile(file_name) and os.path.getsize(file_name) > 0:
+				if not verify_size or self._remote_size(link) in (None, os.path.getsize(file_name)):
+					return True
+
+			part_file_name = None
+
+			try:
+				# the shared session keeps the connections alive across downloads and carries the authentication header
+				with self.session.get(link, stream=True, timeout=(5, 30)) as response:
+					if response.status_code != 200:
+						print(f"Failed to download document from {link}. Status code: {response.status_code}")
+						return False
+
+					# copy the socket stream straight into the file, decoding a gzip or deflate transfer encoding on the fly
+					response.raw.decode_content = True
+					directory, base_name = os.path.split(file_name)
+					# a unique name per download, created with the mode 0o666 so that the kernel applies the umask of the process, as open() does
+					temporary_name = os.path.join(directory, f".{base_name}.{uuid.uuid4().hex}.part")
+					file_descriptor = os.open(temporary_name, _PART_FILE_FLAGS, 0o666)
+					part_file_name = temporary_name
+					with os.fdopen(file_descriptor, 'wb', buffering=1 << 20) as file:
+						shutil.copyfileobj(response.raw, file, length=1 << 16)
+						if fsync:
+							file.flush()
+							os.fsync(file.fileno())
+				os.replace(part_file_name, file_name)
+			except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+				# a single failed download must not abort the others running in the pool
+				print(f"Failed to download document from {link}. Error: {e}")
+				# do not leave a truncated document behind
+				if part_file_name is not None and os.path.exists(part_file_name):
+					os.remove(part_file_name)
+				return False
+
+			return True
+
+	def _remote_size(self, link: str) -> int | None:
+		"""
+		Returns the size in bytes announced by the Content-Length header of a HEAD request on the link, 
+		or None if the request fails or the header is missing, in which case the existing file is trusted.
+		"""
+		try:
+			response = self.session.head(link, allow_redirects=True, timeout=(5, 30))
+			if response.status_code != 200:
+				return None
+			return int(response.headers["Content-Length"])
+		except (requests.exceptions.RequestException, KeyError, ValueError):
+			return None
+
+	def _name_contract(self, df: pd.DataFrame, document_type: str | None = None) -> pd.Series:
 		"""
-		Generates a standardized contract name based on the contractor name, contract number, and document type.
+		Generates the standardized contract names of all rows of a DataFrame, based on the contractor name, contract number, and document type.
 
 		This function removes any characters that are not alphanumeric, underscores, hyphens, parentheses, or spaces
-		from the contractor name, contract number, and document type. It then concatenates these cleaned strings
-		into a single contract name in the format: 'contractor_name_contract_number_document_type.pdf'.
+		from the contractor name and contract number, with vectorized string operations on the whole columns. 
+		It then concatenates these cleaned strings into contract names in the format: 'contractor_name_contract_number_document_type.pdf'.
 
 		Parameters:
-		row (pd.Series): A pandas Series containing the columns 'contractor_name', 'contract_number', and 'document_type'.
+		df (pd.DataFrame): A pandas DataFrame containing the columns 'contractor_name' and 'contract_number'.
+		document_type (str | None): The type of document. Defaults to "CONTRACT".
 
 		Returns:
-		str: The standardized contract name.
+		pd.Series: The standardized contract names, with the index of df.
 
 		Example:
 		>>> import pandas as pd
-		>>> row = pd.Series({
-		...     "contractor_name": "ACME Corp.",
-		...     "contract_number": "123/456",
-		...     "document_type": "CONTRACT"
+		>>> df = pd.DataFrame({
+		...     "contractor_name": ["ACME Corp."],
+		...     "contract_number": ["123/456"],
 		... })
-		>>> name_contract(row)
-		'ACME_Corp_123456_CONTRACT.pdf'
+		>>> _name_contract(df).tolist()
+		['ACME Corp_123456_CONTRACT.pdf']
 		"""
 		if document_type is None:
 			document_type  = "CONTRACT"
-		
-		contractor_name = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["contractor_name"])
-		contract_number = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["contract_number"])
-
-		contract_name = f"{contractor_name}_{contract_number}_{document_type}.pdf"
 
-		return contract_name
+		return _build_names(df=df, columns=_DOCUMENT_KINDS["contract"]["name_columns"], document_type=document_type)
 	
-	def download_contracts(self, df: pd.DataFrame, document_type: str | None = "CONTRACT", sub_folder: str | None = "contracts") -> None:
+	def download_contracts(self, df: pd.DataFrame, document_type: str | None = "CONTRACT", sub_folder: str | None = "contracts", download_path: str | None = None, df_links: pd.DataFrame | None = None, force: bool = False, verify_size: bool = False) -> None:
 		"""
 		Downloads contract documents based on the DataFrame, document type, and optional sub-folder. 
 		The name of the document is generated using the _name_contract() method. 
@@ -141,94 +351,48 @@ class DocumentDownloader:
 		df (pd.DataFrame): DataFrame containing contract information, including 'contract_id'.
 		document_type (str | None): The type of document to download. Defaults to "CONTRACT". If None, downloads all types.
 		sub_folder (str | None): Optional sub-folder to save the downloaded documents. If None, uses the default download path.
+		download_path (str | None): The path in which the sub-folder is created. If None, uses the instance's download_path attribute.
+		df_links (pd.DataFrame | None): The contract document links, as returned by data_fetcher.get_contract_documents(), if they were already fetched. 
+			They may include the documents of other contracts, which are ignored. If None, the links of the contracts of df are fetched.
+		force (bool): If True, the documents are downloaded again even if their file already exists. Defaults to False.
+		verify_size (bool): If True, an existing file is only skipped if its size matches the Content-Length of its link. Defaults to False.
 
 		Returns:
 		None
 		"""
+		return self._download_kind(kind="contract", df=df, document_type=document_type, sub_folder=sub_folder, download_path=download_path, df_links=df_links, force=force, verify_size=verify_size)
 
-		# Extract unique contract IDs from the DataFrame
-		contract_ids = df["contract_id"].drop_duplicates().tolist()
-
-		# Fetch contract document links using the extracted contract IDs
-		df_contract_links = self.data_fetcher.get_contract_documents(contract_ids=contract_ids)
-
-		# Rename columns for clarity
-		df_contract_links = df_contract_links.rename(columns={
-			"id": "contract_document_id",
-			"relationships.contract.data.id": "contract_id", 
-			"links.download": "download_link"
-		})
-
-		# Select relevant columns from the fetched contract links DataFrame
-		df_contract_links = df_contract_links[["contract_document_id", "filename", "contract_id", "download_link", "document_type"]]
-
-		# Merge the original DataFrame with the contract links DataFrame on 'contract_id'
-		df_merged = pd.merge(df, df_contract_links, on="contract_id", how="outer")
-
-		# Filter the merged DataFrame by the specified document type, if provided
-		if document_type is not None:
-			df_merged = df_merged[df_merged["document_type"] == document_type]
-
-		# Extract download links from the filtered DataFrame
-		download_links = df_merged["download_link"].tolist()
-
-		# Generate standardized contract names for each row in the original DataFrame
-		contract_names = df_merged.apply(lambda row: self._name_contract(row=row, document_type=document_type), axis=1)
-
-		if sub_folder is not None:
-			download_path = self.download_path + "/" + sub_folder
-		else:
-			download_path = self.download_path
-		
-		# drop files with no link
-		df_merged = df_merged.dropna(subset=["download_link"])
-
-		# If verbose mode is enabled, print a message indicating the start of the downloading process
-		if self.verbose:
-			print(f"Downloading contract documents for {len(contract_names)} documents with names : {contract_names[:3]} ...")
-			
-		# Download the documents using the extracted download links and generated contract names
-		self.download_documents(document_download_links=download_links, document_names=contract_names, download_path=download_path)
-
-		return None
-
-	def _name_invoice(self, row: pd.Series, document_type: str | None = None) -> str:
+	def _name_invoice(self, df: pd.DataFrame, document_type: str | None = None) -> pd.Series:
 		"""
-		Generates a standardized name for an invoice document based on the row data and document type.
+		Generates the standardized invoice document names of all rows of a DataFrame, based on the row data and document type.
 
 		This function removes any characters that are not alphanumeric, underscores, hyphens, parentheses, or spaces
-		from the contractor name, contract number, and invoice number. It then concatenates these cleaned strings
-		into a single invoice name in the format: 'contractor_name_contract_number_invoice_number_document_type.pdf'.
+		from the contractor name, contract number, and invoice number, with vectorized string operations on the whole columns. 
+		It then concatenates these cleaned strings into invoice names in the format: 'contractor_name_contract_number_invoice_number_document_type.pdf'.
 
 		Parameters:
-		row (pd.Series): A pandas Series containing the columns 'contractor_name', 'contract_number', and 'invoice_number'.
+		df (pd.DataFrame): A pandas DataFrame containing the columns 'contractor_name', 'contract_number', and 'invoice_number'.
 		document_type (str | None): The type of document. Defaults to "INVOICE".
 
 		Returns:
-		str: The standardized name for the invoice document.
+		pd.Series: The standardized names of the invoice documents, with the index of df.
 
 		Example:
 		>>> import pandas as pd
-		>>> row = pd.Series({
-		...     "contractor_name": "ACME Corp.",
-		...     "contract_number": "123/456",
-		...     "invoice_number": "789/1011"
+		>>> df = pd.DataFrame({
+		...     "contractor_name": ["ACME Corp."],
+		...     "contract_number": ["123/456"],
+		...     "invoice_number": ["789/1011"],
 		... })
-		>>> _name_invoice(row)
-		'ACME_Corp_123456_7891011_INVOICE.pdf'
+		>>> _name_invoice(df).tolist()
+		['ACME Corp_123456_7891011_INVOICE.pdf']
 		"""
 		if document_type is None:
 			document_type = "INVOICE"
 
-		contract_number = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["contract_number"])
-		contractor_name = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["contractor_name"])
-		invoice_number = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["invoice_number"])
+		return _build_names(df=df, columns=_DOCUMENT_KINDS["invoice"]["name_columns"], document_type=document_type)
 
-		invoice_name = f"{contractor_name}_{contract_number}_{invoice_number}_{document_type}.pdf"		
-		
-		return invoice_name
-
-	def download_invoices(self, df: pd.DataFrame, document_type: str | None = "INVOICE", sub_folder: str | None = "invoices") -> None:
+	def download_invoices(self, df: pd.DataFrame, document_type: str | None = "INVOICE", sub_folder: str | None = "invoices", download_path: str | None = None, df_links: pd.DataFrame | None = None, force: bool = False, verify_size: bool = False) -> None:
 		"""
 		Downloads invoice documents based on the DataFrame, document type, and optional sub-folder. 
 		The name of the document is generated using the _name_invoice() method. 
@@ -238,91 +402,48 @@ class DocumentDownloader:
 		df (pd.DataFrame): DataFrame containing invoice information, including 'invoice_id'.
 		document_type (str | None): The type of document to download. Defaults to "INVOICE". If None, downloads all types.
 		sub_folder (str | None): Optional sub-folder to save the downloaded documents. If None, uses the default download path.
+		download_path (str | None): The path in which the sub-folder is created. If None, uses the instance's download_path attribute.
+		df_links (pd.DataFrame | None): The invoice document links, as returned by data_fetcher.get_invoice_documents(), if they were already fetched. 
+			They may include the documents of other invoices, which are ignored. If None, the links of the invoices of df are fetched.
+		force (bool): If True, the documents are downloaded again even if their file already exists. Defaults to False.
+		verify_size (bool): If True, an existing file is only skipped if its size matches the Content-Length of its link. Defaults to False.
 
 		Returns:
 		None
 		"""
+		return self._download_kind(kind="invoice", df=df, document_type=document_type, sub_folder=sub_folder, download_path=download_path, df_links=df_links, force=force, verify_size=verify_size)
 
-		# Extract unique invoice IDs from the DataFrame
-		invoice_ids = df["invoice_id"].drop_duplicates().tolist()
-
-		# Fetch invoice document links using the extracted invoice IDs
-		df_invoice_links = self.data_fetcher.get_invoice_documents(invoice_ids=invoice_ids)
-
-		# Rename columns for clarity
-		df_invoice_links = df_invoice_links.rename(columns={
-			"id": "invoice_document_id", 
-			"relationships.invoice.data.id": "invoice_id", 
-			"links.download": "download_link"})
-
-		# Select relevant columns from the fetched invoice links DataFrame
-		df_invoice_links = df_invoice_links[["invoice_document_id", "filename", "invoice_id", "download_link", "document_type"]]
-
-		# Merge the original DataFrame with the invoice links DataFrame on 'invoice_id'
-		df_merged = pd.merge(df, df_invoice_links, on="invoice_id", how="outer")
-
-		# Filter the merged DataFrame by the specified document type, if provided
-		if document_type is not None:
-			df_merged = df_merged[df_merged["document_type"] == document_type]
-
-		# Extract download links from the filtered DataFrame
-		download_links = df_merged["download_link"].tolist()
-
-		# Generate standardized invoice names for each row in the original DataFrame
-		invoice_names = df_merged.apply(lambda row: self._name_invoice(row=row, document_type=document_type), axis=1)
-
-		if sub_folder is not None:
-			download_path = self.download_path + "/" + sub_folder
-		else:
-			download_path = self.download_path
-
-		# If verbose mode is enabled, print a message indicating the start of the downloading process
-		if self.verbose:
-			print(f"Downloading invoice documents for {len(invoice_names)} documents with names : {invoice_names[:3]} ...")
-
-		# Download the documents using the extracted download links and generated invoice names
-		self.download_documents(document_download_links=download_links, document_names=invoice_names, download_path=download_path)
-
-		return None
-	
-	def _name_change_order(self, row: pd.Series, document_type: str | None = None) -> str:
+	def _name_change_order(self, df: pd.DataFrame, document_type: str | None = None) -> pd.Series:
 		"""
-		Generates a standardized change order name based on the contractor name, contract number, document type, and change order identifier.
+		Generates the standardized change order names of all rows of a DataFrame, based on the contractor name, contract number, document type, and change order identifier.
 
 		This function removes any characters that are not alphanumeric, underscores, hyphens, parentheses, or spaces
-		from the contractor name, contract number, document type, and change order identifier. It then concatenates these cleaned strings
-		into a single change order name in the format: 'contractor_name_contract_number_document_type_change_order_identifier.pdf'.
+		from the contractor name, contract number, and change order identifier, with vectorized string operations on the whole columns. 
+		It then concatenates these cleaned strings into change order names in the format: 'contractor_name_contract_number_document_type_change_order_identifier.pdf'.
 
 		Parameters:
-		row (pd.Series): A pandas Series containing the columns 'contractor_name', 'contract_number', 'document_type', and 'change_order_identifier'.
+		df (pd.DataFrame): A pandas DataFrame containing the columns 'contractor_name', 'contract_number', and 'change_order_identifier'.
 		document_type (str | None): The type of document. Defaults to "CHANGE-ORDER".
 
 		Returns:
-		str: The standardized change order name.
+		pd.Series: The standardized change order names, with the index of df.
 
 		Example:
 		>>> import pandas as pd
-		>>> row = pd.Series({
-		...     "contractor_name": "ACME Corp.",
-		...     "contract_number": "123/456",
-		...     "document_type": "CHANGE-ORDER",
-		...     "change_order_identifier": "CO-789"
+		>>> df = pd.DataFrame({
+		...     "contractor_name": ["ACME Corp."],
+		...     "contract_number": ["123/456"],
+		...     "change_order_identifier": ["CO-789"],
 		... })
-		>>> name_change_order(row)
-		'ACME_Corp_123456_CHANGE-ORDER_CO-789.pdf'
+		>>> _name_change_order(df, document_type="CHANGE-ORDER").tolist()
+		['ACME Corp_123456_CHANGE-ORDER_CO-789.pdf']
 		"""
 		if document_type is None:
 			document_type  = "CHANGE-ORDER"
-		
-		contractor_name = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["contractor_name"])
-		contract_number = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["contract_number"])
-		change_order_identifier = re.sub(r'[^a-zA-Z0-9_\-() ]', '', row["change_order_identifier"])
-
-		change_order_name = f"{contractor_name}_{contract_number}_{document_type}_{change_order_identifier}.pdf"
 
-		return change_order_name
+		return _build_names(df=df, columns=_DOCUMENT_KINDS["change_order"]["name_columns"], document_type=document_type, document_type_position=2)
 
-	def download_change_orders(self, df: pd.DataFrame, document_type: str | None = "CHANGE_ORDER", sub_folder: str | None = "change_orders") -> None:
+	def download_change_orders(self, df: pd.DataFrame, document_type: str | None = "CHANGE_ORDER", sub_folder: str | None = "change_orders", download_path: str | None = None, df_links: pd.DataFrame | None = None, force: bool = False, verify_size: bool = False) -> None:
 		"""
 		Downloads change order documents based on the DataFrame, document type, and optional sub-folder. 
 		The name of the document is generated using the _name_change_order() method. 
@@ -332,67 +453,117 @@ class DocumentDownloader:
 		df (pd.DataFrame): DataFrame containing change order information, including 'change_order_id'.
 		document_type (str | None): The type of document to download. Defaults to "CHANGE-ORDER". If None, downloads all types.
 		sub_folder (str | None): Optional sub-folder to save the downloaded documents. If None, uses the default download path.
+		download_path (str | None): The path in which the sub-folder is created. If None, uses the instance's download_path attribute.
+		df_links (pd.DataFrame | None): The change order document links, as returned by data_fetcher.get_change_order_documents(), if they were already fetched. 
+			They may include the documents of other change orders, which are ignored. If None, the links of the change orders of df are fetched.
+		force (bool): If True, the documents are downloaded again even if their file already exists. Defaults to False.
+		verify_size (bool): If True, an existing file is only skipped if its size matches the Content-Length of its link. Defaults to False.
 
 		Returns:
 		None
 		"""
+		return self._download_kind(kind="change_order", df=df, document_type=document_type, sub_folder=sub_folder, download_path=download_path, df_links=df_links, force=force, verify_size=verify_size)
+
+	def _download_kind(
+			self, 
+			kind: str, 
+			df: pd.DataFrame, 
+			document_type: str | None, 
+			sub_folder: str | None, 
+			download_path: str | None, 
+			df_links: pd.DataFrame | None,
+			force: bool = False,
+			verify_size: bool = False
+			) -> None:
+		"""
+		Downloads the documents of one kind (contract, invoice or change order), as described in _DOCUMENT_KINDS. 
+		Implements download_contracts(), download_invoices() and download_change_orders(), see their parameters.
+		"""
+		config = _DOCUMENT_KINDS[kind]
+		id_column = config["id_column"]
+
+		if df_links is None:
+			# Extract the unique non-null IDs from the DataFrame
+			ids = df[id_column].dropna().unique().tolist()
 
-		# Extract unique change order IDs from the DataFrame
-		change_order_ids = df["change_order_id"].drop_duplicates().tolist()
+			# Fetch the document links using the extracted IDs
+			df_links = getattr(self.data_fetcher, config["fetch"])(**{config["fetch_argument"]: ids})
 
-		# Fetch change order document links using the extracted change order IDs
-		df_change_order_links = self.data_fetcher.get_change_order_documents(change_order_ids=change_order_ids)
+		if df_links.empty:
+			if self.verbose:
+				print(f"No {config['label']} document to download.")
+			return None
 
-		# Rename columns for clarity
-		df_change_order_links = df_change_order_links.rename(columns={
-			"id": "change_order_document_id",
-			"relationships.change_order.data.id": "change_order_id",
+		# Select only the columns used to filter, join and download the documents from the fetched links DataFrame, 
+		# so that the join does not copy the other columns, and rename them for clarity
+		df_links = df_links[[config["relationship"], "links.download", "document_type"]].rename(columns={
+			config["relationship"]: id_column,
 			"links.download": "download_link"
 		})
-		# Select relevant columns from the fetched change order links DataFrame
-		df_change_order_links = df_change_order_links[["change_order_document_id", "change_order_id", "download_link", "document_type", "filename"]]
 
-		# Merge the original DataFrame with the change order links DataFrame on 'change_order_id'
-		df_merged = pd.merge(df, df_change_order_links, on="change_order_id", how="outer")
-
-		# Filter the merged DataFrame by the specified document type, if provided
+		# Filter the links by the specified document type, if provided, before the join so that only the needed rows are joined
 		if document_type is not None:
-			df_merged = df_merged[df_merged["document_type"] == document_type]
+			df_links = df_links[df_links["document_type"] == document_type]
+
+		# Join the links, indexed on the id column, to the original DataFrame. 
+		# Only the rows of the original DataFrame having a document are kept, with the columns needed to name them
+		df_merged = df[[id_column, *config["name_columns"]]].join(df_links.set_index(id_column), on=id_column, how="inner")
+
+		# Drop the documents with no link before generating the names, so that the links and names stay aligned. 
+		# A document joined to several rows of the original DataFrame is downloaded only once
+		df_merged = df_merged.dropna(subset=["download_link"]).drop_duplicates(subset=["download_link"], ignore_index=True)
 
 		# Extract download links from the filtered DataFrame
 		download_links = df_merged["download_link"].tolist()
 
-		# Generate standardized change order names for each row in the original DataFrame
-		change_order_names = df_merged.apply(lambda row: self._name_change_order(row=row, document_type=document_type), axis=1)
+		# Generate standardized names for all rows of the merged DataFrame at once
+		document_names = getattr(self, config["name"])(df=df_merged, document_type=document_type).tolist()
 
-		if sub_folder is not None:
-			download_path = self.download_path + "/" + sub_folder
-		else:
+		if download_path is None:
 			download_path = self.download_path
+		if sub_folder is not None:
+			download_path = os.path.join(download_path, sub_folder)
 
 		# If verbose mode is enabled, print a message indicating the start of the downloading process
 		if self.verbose:
-			print(f"Downloading change order documents for {len(change_order_names)} documents with names : {change_order_names[:3]} ...")
+			print(f"Downloading {config['label']} documents for {len(document_names)} documents with names : {document_names[:3]} ...")
 
-		# Download the documents using the extracted download links and generated change order names
-		self.download_documents(document_download_links=download_links, document_names=change_order_names, download_path=download_path)
+		# Download the documents using the extracted download links and generated names
+		self.download_documents(document_download_links=download_links, document_names=document_names, download_path=download_path, force=force, verify_size=verify_size)
 
 		return None
 
+	@staticmethod
+	def _project_ids(df: pd.DataFrame, project_names: list, id_column: str) -> list:
+		"""
+		Returns the unique non-null ids of the given column, for the rows of the given projects only.
+		"""
+		return df.loc[df["project_name"].isin(project_names), id_column].dropna().unique().tolist()
+
 	def batch_download_documents(self, 
 							dfs: Dict[str, pd.DataFrame], 
 							property_name: str | None = None, 
 							project_names: List[str] | None = None, 
-							download_path: str | None = None
+							download_path: str | None = None,
+							max_projects: int = 4,
+							force: bool = False,
+							verify_size: bool = False
 							) -> None:
 		"""
 		Downloads all documents (contracts, change orders, invoices) for a given property or list of projects.
+		The projects are processed concurrently, each one in its own sub-folder of the download path. 
+		Their downloads share the max_workers download slots of the instance, so that the concurrent requests never exceed the connection pool of the session.
 
 		Args:
 			dfs (Dict[str, pd.DataFrame]): Dictionary of DataFrames containing the data.
 			property_name (str | None): The name of the property to filter projects. Defaults to None.
 			project_names (List[str] | None): List of project names to download documents for. Defaults to None.
 			download_path (str | None): The base path where documents will be downloaded. Defaults to None.
+			max_projects (int): The number of projects processed concurrently. Defaults to 4.
+			force (bool): If True, the documents are downloaded again even if their file already exists, 
+				e.g. to update the documents changed since the previous run. Defaults to False.
+			verify_size (bool): If True, an existing file is only skipped if its size matches the Content-Length 
+				returned by a HEAD request on its link, so that only the changed documents are downloaded again. Defaults to False.
 
 		Raises:
 			ValueError: If neither property_name nor project_names are provided.
@@ -402,38 +573,54 @@ class DocumentDownloader:
 			raise ValueError("Please provide either a property name or a list of project names")
 
 		df_core = self.data_transformer.consolidate_core_DataFrames(dfs=dfs)
-		df_contracts = df_core.copy()
+		# df_core is only read, the contracts are downloaded from it directly
+		df_contracts = df_core
 		df_invoices = self.data_transformer.consolidate_invoices_DataFrame(df_core=df_core, df_invoices=dfs["invoices"])
 		df_change_orders = self.data_transformer.consolidate_change_orders_DataFrame(df_core=df_core, df_change_orders=dfs["change_orders"])
 
 		if project_names is None:
-			project_names = df_core[df_core["property_name"] == property_name]["project_name"].drop_duplicates().tolist()
-
-		core_path = self.download_path[:]
-		download_path = download_path if download_path is not None else self.download_path[:]
-
-		for project_name in project_names:
-
-			# Create subsets of the DataFrames for each project
-			subset_df_contracts = df_contracts[df_contracts["project_name"] == project_name].copy()
-			subset_df_invoices = df_invoices[df_invoices["project_name"] == project_name].copy()
-			subset_df_change_orders = df_change_orders[df_change_orders["project_name"] == project_name].copy()
-
-			# Set path for downloading documents for this project
+			project_names = df_core[df_core["property_name"] == property_name]["project_name"].unique().tolist()
+
+		download_path = download_path if download_path is not None else self.download_path
+
+		# Fetch the document links of all the projects at once, instead of listing them again for every project. 
+		# The three listings are independent from each other, so they are fetched concurrently
+		dfs_by_kind = {"contract": df_contracts, "invoice": df_invoices, "change_order": df_change_orders}
+		with ThreadPoolExecutor(max_workers=len(dfs_by_kind)) as executor:
+			future_links = {}
+			for kind, df_kind in dfs_by_kind.items():
+				config = _DOCUMENT_KINDS[kind]
+				ids = self._project_ids(df=df_kind, project_names=project_names, id_column=config["id_column"])
+				future_links[kind] = executor.submit(getattr(self.data_fetcher, config["fetch"]), **{config["fetch_argument"]: ids})
+			contract_links, invoice_links, change_order_links = (future_links[kind].result() for kind in dfs_by_kind)
+
+		# Split the DataFrames by project in a single pass each, instead of scanning them again for every project
+		contracts_by_project = dict(list(df_contracts.groupby("project_name", sort=False)))
+		invoices_by_project = dict(list(df_invoices.groupby("project_name", sort=False)))
+		change_orders_by_project = dict(list(df_change_orders.groupby("project_name", sort=False)))
+
+		def download_project(project_name: str) -> None:
+			# Get the subsets of the DataFrames for each project, empty if the project has no row
+			subset_df_contracts = contracts_by_project.get(project_name, df_contracts.iloc[:0])
+			subset_df_invoices = invoices_by_project.get(project_name, df_invoices.iloc[:0])
+			subset_df_change_orders = change_orders_by_project.get(project_name, df_change_orders.iloc[:0])
+
+			# Path for downloading documents for this project, passed explicitly so that the projects can run concurrently
 			project_download_path = os.path.join(download_path, project_name)
-			self.download_path = project_download_path
 
 			if self.verbose:
 				print(f"Downloading documents for project: {project_name}")
 
 			# Download documents
-			self.download_contracts(df=subset_df_contracts)
-			self.download_invoices(df=subset_df_invoices)
-			self.download_change_orders(df=subset_df_change_orders)
+			self.download_contracts(df=subset_df_contracts, download_path=project_download_path, df_links=contract_links, force=force, verify_size=verify_size)
+			self.download_invoices(df=subset_df_invoices, download_path=project_download_path, df_links=invoice_links, force=force, verify_size=verify_size)
+			self.download_change_orders(df=subset_df_change_orders, download_path=project_download_path, df_links=change_order_links, force=force, verify_size=verify_size)
+
+		with ThreadPoolExecutor(max_workers=max_projects) as executor:
+			# consume the results, so that an exception raised for a project is not silently ignored
+			list(executor.map(download_project, project_names))
 
 		if self.verbose:
 			print("Batch download completed.")
-		
-		self.download_path = core_path
 
 		return
\ No newline at end of file
@@ -1,14 +1,27 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from alasco.document_downloader import DocumentDownloader
 from alasco.data_fetcher import DataFetcher
+from alasco.utils import Utils
 
 class DocumentUploader:
 
-	def __init__(self, header, verbose = False) -> None:
+	def __init__(
+			self, 
+			header, 
+			verbose = False, 
+			session: requests.Session | None = None,
+			data_fetcher: DataFetcher | None = None,
+			document_downloader: DocumentDownloader | None = None
+			) -> None:
 		self.header = header
 		self.verbose = verbose # set to True if all details needs to be printed
-		self.data_fetcher = DataFetcher(header=self.header, verbose=self.verbose)
-		self.document_downloader = DocumentDownloader(header=self.header, verbose=self.verbose)
+		self.session = session if session is not None else Utils().create_session(header=header)
+		# reuse the instances of the Alasco client if provided, the downloader is then not created (nor its download folder)
+		self.data_fetcher = data_fetcher if data_fetcher is not None else DataFetcher(header=self.header, verbose=self.verbose, session=self.session)
+		if document_downloader is None:
+			document_downloader = DocumentDownloader(header=self.header, verbose=self.verbose, session=self.session, data_fetcher=self.data_fetcher)
+		self.document_downloader = document_downloader
 
 		# URL API end points
 		self.url_upload_contract = "https://api.alasco.de/v1/contracts/{contract_id}/documents/"
@@ -21,9 +34,28 @@ class DocumentUploader:
 		self.document_types_invoice = ["ATTACHMENT", "AUDITED_INVOICE", "COVERSHEET_EXTERNAL", "EXTERNAL_CORRESPONDENCE", "INTERNAL_CORRESPONDENCE",\
 										"INVOICE", "OTHER", "PAYMENT_CERTIFICATE", "PLANS", "PROTOCOL", "REVISED_INVOICE", "VALUATIONS"]
 	
-	def _file_to_bytes(self, file_path:str) -> bytes:
-		with open(file_path, "rb") as file:
-			return file.read()
+	def _check_upload(self, document_kind: str, upload: dict) -> None:
+		"""
+		Checks the parameters of an upload to a contract, change order or invoice, without making any API call.
+
+		Raises:
+		-------
+		ValueError
+			If any of the required parameters (document_type, file_path, file_name and the id of the object) are missing.
+			If the document_type is not accepted for this kind of object.
+		"""
+		id_key = f"{document_kind}_id"
+		if not all(upload.get(key) for key in ["document_type", "file_path", "file_name", id_key]):
+			raise ValueError(f"Missing required parameters. Please provide document_type, file_path, file_name, and {id_key}")
+
+		document_type = upload.get("document_type")
+		if document_kind == "contract":
+			if document_type != "CONTRACT" and document_type != "ATTACHMENT":
+				raise ValueError(f"The document_type must to be either 'CONTRACT' or 'ATTACHMENT'.\nYou specified: {document_type}.")
+		else:
+			document_types = self.document_types_change_order if document_kind == "change_order" else self.document_types_invoice
+			if document_type not in document_types:
+				raise ValueError(f"The document_type does not match any of the acceptable types.\nYou specified: {document_type}.")
 
 	def upload_contract(self, **kwargs) -> requests.Response:
 		"""
@@ -56,32 +88,27 @@ class DocumentUploader:
 		file_name = kwargs.get("file_name")
 		contract_id = kwargs.get("contract_id")
 
-		# Check if required parameters are provided
-		if not all([document_type, file_path, file_name, contract_id]):
-			raise ValueError("Missing required parameters. Please provide document_type, file_path, file_name, and contract_id")
-
-		# Check doc types corrects
-		if document_type != "CONTRACT" and document_type != "ATTACHMENT":
-			raise ValueError(f"The document_type must to be either 'CONTRACT' or 'ATTACHMENT'.\nYou specified: {document_type}.")
+		# Check the parameters, with the same checks as upload_documents() runs before any upload of a batch
+		self._check_upload(document_kind="contract", upload=kwargs)
 		
 		# Prepare argument for the API call
 		url = self.url_upload_contract.format(contract_id=contract_id)
-		file_content = self._file_to_bytes(file_path=file_path)
-		files = {
-			"upload": (file_name, file_content)
-		}
-		headers = self.header
 		data = {
 			"document_type": document_type
 		}
 
-		# Make the call
-		response = requests.post(
-			url = url,
-			data=data,
-			headers=headers,
-			files=files
-		)
+		# Make the call with the shared session, which reuses the pooled connections and carries the authentication header. 
+		# The POST calls are not retried by the session, as they are not idempotent. 
+		# The file is handed over open, so that it is read only once, while the request body is encoded
+		with open(file_path, "rb") as file:
+			files = {
+				"upload": (file_name, file)
+			}
+			response = self.session.post(
+				url = url,
+				data=data,
+				files=files
+			)
 		
 		return response
 
@@ -116,32 +143,27 @@ class DocumentUploader:
 		file_name = kwargs.get("file_name")
 		change_order_id = kwargs.get("change_order_id")
 
-		# Check if required parameters are provided
-		if not all([document_type, file_path, file_name, change_order_id]):
-			raise ValueError("Missing required parameters. Please provide document_type, file_path, file_name, and change_order_id")
-
-		# Check doc types corrects
-		if document_type not in self.document_types_change_order:
-			raise ValueError(f"The document_type does not match any of the acceptable types.\nYou specified: {document_type}.")
+		# Check the parameters, with the same checks as upload_documents() runs before any upload of a batch
+		self._check_upload(document_kind="change_order", upload=kwargs)
 		
 		# Prepare argument for the API call
 		url = self.url_upload_change_order.format(change_order_id=change_order_id)
-		file_content = self._file_to_bytes(file_path=file_path)
-		files = {
-			"upload": (file_name, file_content)
-		}
-		headers = self.header
 		data = {
 			"document_type": document_type
 		}
 
-		# Make the call
-		response = requests.post(
-			url = url,
-			data=data,
-			headers=headers,
-			files=files
-		)
+		# Make the call with the shared session, which reuses the pooled connections and carries the authentication header. 
+		# The POST calls are not retried by the session, as they are not idempotent. 
+		# The file is handed over open, so that it is read only once, while the request body is encoded
+		with open(file_path, "rb") as file:
+			files = {
+				"upload": (file_name, file)
+			}
+			response = self.session.post(
+				url = url,
+				data=data,
+				files=files
+			)
 		
 		if self.verbose:
 			print(response)
@@ -179,34 +201,80 @@ class DocumentUploader:
 		file_name = kwargs.get("file_name")
 		invoice_id = kwargs.get("invoice_id")
 
-		# Check if required parameters are provided
-		if not all([document_type, file_path, file_name, invoice_id]):
-			raise ValueError("Missing required parameters. Please provide document_type, file_path, file_name, and invoice_id")
-
-		# Check doc types corrects
-		if document_type not in self.document_types_invoice:
-			raise ValueError(f"The document_type does not match any of the acceptable types.\nYou specified: {document_type}.")
+		# Check the parameters, with the same checks as upload_documents() runs before any upload of a batch
+		self._check_upload(document_kind="invoice", upload=kwargs)
 		
 		# Prepare argument for the API call
 		url = self.url_upload_invoice.format(invoice_id=invoice_id)
-		file_content = self._file_to_bytes(file_path=file_path)
-		files = {
-			"upload": (file_name, file_content)
-		}
-		headers = self.header
 		data = {
 			"document_type": document_type
 		}
 
-		# Make the call
-		response = requests.post(
-			url = url,
-			data=data,
-			headers=headers,
-			files=files
-		)
+		# Make the call with the shared session, which reuses the pooled connections and carries the authentication header. 
+		# The POST calls are not retried by the session, as they are not idempotent. 
+		# The file is handed over open, so that it is read only once, while the request body is encoded
+		with open(file_path, "rb") as file:
+			files = {
+				"upload": (file_name, file)
+			}
+			response = self.session.post(
+				url = url,
+				data=data,
+				files=files
+			)
 		
 		if self.verbose:
 			print(response)
 			
-		return response
\ No newline at end of file
+		return response
+
+	def upload_documents(self, uploads: list[dict], document_kind: str, max_workers: int = 8) -> list[requests.Response | Exception]:
+		"""
+		Uploads several documents concurrently, e.g. all the attachments of a project, over the shared session.
+		The parameters of all the uploads are checked before the first one is sent, so that an invalid batch uploads nothing. 
+		A failed upload does not stop the others: its exception is returned in place of its response, 
+		so that the caller knows exactly which documents were uploaded and only retries the failed ones.
+
+		Parameters:
+		-----------
+		uploads : list[dict]
+			The keyword arguments of each upload, as expected by upload_contract(), upload_change_order() or upload_invoice().
+		document_kind : str
+			The kind of the objects to which the documents are uploaded, either 'contract', 'change_order' or 'invoice'.
+		max_workers : int
+			The maximum number of concurrent uploads, kept small to respect the rate limit of the API. Defaults to 8.
+
+		Returns:
+		--------
+		list[requests.Response | Exception]
+			The response of each upload, or the exception raised while uploading it (e.g. a connection error), in the order of uploads.
+
+		Raises:
+		-------
+		ValueError
+			If the document_kind is not supported, or if the parameters of one of the uploads are invalid. 
+			No document is uploaded in that case.
+		"""
+		upload_methods = {
+			"contract": self.upload_contract,
+			"change_order": self.upload_change_order,
+			"invoice": self.upload_invoice,
+		}
+		if document_kind not in upload_methods:
+			raise ValueError(f"The document_kind must be one of {list(upload_methods)}.\nYou specified: {document_kind}.")
+		upload_method = upload_methods[document_kind]
+
+		# Check the whole batch first, as the POST calls already sent cannot be undone
+		for upload in uploads:
+			self._check_upload(document_kind=document_kind, upload=upload)
+
+		results = []
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			futures = [executor.submit(upload_method, **upload) for upload in uploads]
+			for future in futures:
+				try:
+					results.append(future.result())
+				except Exception as error:
+					results.append(error)
+
+		return results
@@ -1,6 +1,17 @@
 import json
+from itertools import islice
+import requests
+import numpy as np
 import pandas as pd
 from datetime import date
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is an optional dependency (pip install alasco[fast]) to parse the API responses faster
+try:
+	import orjson
+except ImportError:
+	orjson = None
 
 TODAY = date.today()
 
@@ -8,16 +19,55 @@ class Utils:
 	def __init__(self) -> None:
 		self.BASE_URL = "https://api.alasco.de/v1/"
 		
-	def printResponse(self, response):
-		responseJSON = response.json()
-		responseSTR = json.dumps(responseJSON, indent=3)
+	def printResponse(self, response, verbose: bool = True):
+		"""
+		Prints the status code and the indented JSON body of a response. 
+		The body is only parsed and formatted when verbose is True, otherwise only the status code is printed.
+		"""
 		print(f"Status code: {response.status_code}")
-		print(f"Response:\n{responseSTR}")
+		if not verbose:
+			return
+		print(f"Response:\n{self.json_dumps(response.json())}")
+
+	def printJSON(self, responseJSON, verbose: bool = True):
+		"""
+		Prints an indented JSON document. Nothing is formatted when verbose is False.
+		"""
+		if not verbose:
+			return
+		print(f"Response:\n{self.json_dumps(responseJSON)}")
+
+	def json_dumps(self, obj) -> str:
+		"""
+		Formats a JSON document as an indented string, with orjson if it is installed, else with the standard json module.
+
+		Parameters:
+			obj: The JSON document (dict, list, ...) to format.
+
+		Returns:
+			str: The document indented by 2 spaces.
+		"""
+		if orjson is not None:
+			try:
+				return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+			except TypeError:
+				# orjson rejects some values the json module accepts (e.g. integers above 64 bits, non-string keys)
+				pass
+		return json.dumps(obj, indent=2)
+
+	def json_loads(self, content: bytes | str):
+		"""
+		Decodes a JSON document, with orjson if it is installed, else with the standard json module.
 
-	def printJSON(self, responseJSON):
-		responseSTR = json.dumps(responseJSON, indent=3)
-		print(f"Response:\n{responseSTR}")
+		Parameters:
+			content (bytes | str): The raw JSON document, for example the content of a response.
 
+		Returns:
+			The decoded JSON document.
+		"""
+		if orjson is not None:
+			return orjson.loads(content)
+		return json.loads(content)
 
 	def headerParameters(self, token: str, key: str):
 		"""
@@ -29,54 +79,78 @@ class Utils:
 		}
 		return headerParameters
 
+	def create_session(self, header: dict, pool_connections: int = 16, pool_maxsize: int = 32, max_retries: int = 5) -> requests.Session:
+		"""
+		Creates a requests.Session with the authentication header and a pooled, retrying HTTP adapter.
+		Reusing this session across calls keeps the TCP/TLS connections to the Alasco API alive.
+		The GET calls are retried on rate limiting (429) and server errors, honoring the Retry-After header of the API.
+
+		Parameters:
+			header (dict): The header containing API key and token for authentication.
+			pool_connections (int): The number of connection pools to cache. Defaults to 16.
+			pool_maxsize (int): The maximum number of connections to keep in each pool. Defaults to 32.
+			max_retries (int): The maximum number of retries of a failed GET call. Defaults to 5.
 
-	def split_list(self, input_list: list, chunk_size: int) -> list:
+		Returns:
+			requests.Session: The configured session.
+		"""
+		retry = Retry(
+			total=max_retries,
+			backoff_factor=0.5,
+			status_forcelist=[429, 500, 502, 503, 504],
+			allowed_methods=["GET"],
+			respect_retry_after_header=True,
+			# return the last response once the retries are exhausted, so that raise_for_status() reports it
+			raise_on_status=False,
+		)
+		adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+		session = requests.Session()
+		session.headers.update(header)
+		session.mount("https://", adapter)
+		return session
+
+
+	def split_list(self, input_list: list, chunk_size: int):
 		"""
 		Splits a list into smaller chunks of a specified size.
 
+		The chunks are produced lazily, one at a time, so that the chunked copy of a large list is never held in memory at once. 
+		Use math.ceil(len(input_list) / chunk_size) to get the number of chunks.
+
 		Parameters:
-			input_list (list): The list to split.
+			input_list (list): The list (or any iterable) to split.
 			chunk_size (int): The size of each chunk.
 
 		Returns:
-			list: A list of lists, where each sublist is a chunk of the original list.
+			Iterator[list]: An iterator of lists, where each list is a chunk of the original list.
 
 		Raises:
 			ValueError: If chunk_size is less than or equal to 0.
 		"""
 		if chunk_size <= 0:
 			raise ValueError("chunk_size must be greater than 0")
-		return [input_list[i*chunk_size:(i+1)*chunk_size] for i in range((len(input_list) + chunk_size - 1) // chunk_size)]
+		iterator = iter(input_list)
+		# iter() calls the lambda until it returns the sentinel, i.e. an empty chunk once the list is exhausted
+		return iter(lambda: list(islice(iterator, chunk_size)), [])
 
-	def get_ids(self, df: pd.DataFrame) -> list:
+	def get_ids(self, df: pd.DataFrame, *, as_list: bool = True) -> list | np.ndarray:
 		"""
 		Extracts the 'id' column from a DataFrame and returns it as a list.
 
 		Parameters:
 		df (pd.DataFrame): The DataFrame from which to extract the 'id' column.
+		as_list (bool): If False, returns the underlying array of the column without copying it into a list, 
+			which is enough when the IDs are only iterated over. Defaults to True.
 
 		Returns:
-		list: A list of IDs extracted from the 'id' column of the DataFrame.
+		list | np.ndarray: The IDs extracted from the 'id' column of the DataFrame, aligned with its rows.
 
 		Raises:
 		KeyError: If the 'id' column is not found in the DataFrame.
 		"""
 		try:
-			return df["id"].tolist()
+			ids = df["id"]
 		except KeyError:
 			raise KeyError("The key 'id' was not found in the DataFrame.")
-
-	def _prepare_url_get_contract_documents(self, contract_id:str):
-		url = self.BASE_URL
-		url += f"contracts/{contract_id}/documents/"
-		return url
-
-	def _prepare_url_get_change_order_documents(self, change_order_id:str):
-		url = self.BASE_URL
-		url += f"change_orders/{change_order_id}/documents/"
-		return url
-
-	def _prepare_url_get_invoice_documents(self, invoice_id:str):
-		url = self.BASE_URL
-		url += f"invoices/{invoice_id}/documents/"
-		return url
+		return ids.tolist() if as_list else ids.to_numpy(copy=False)